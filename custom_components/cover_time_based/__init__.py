@@ -13,15 +13,80 @@ from homeassistant.const import CONF_ENTITY_ID
 from homeassistant.core import callback
 from homeassistant.core import Event
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.event import async_track_entity_registry_updated_event
+from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.typing import ConfigType
 
 from .const import CONF_ENTITY_DOWN
-from .const import CONF_ENTITY_UP
+from .const import DATA_SETUP_TIMES
+from .const import DATA_WIRING
+from .const import DOMAIN
+from .cover import async_apply_options
+from .cover import async_resolve_wiring
+from .cover import generate_unique_id
+from .dispatcher import async_get_registry_dispatcher
+from .learning import async_get_learner
+from .services import async_provision_covers
+from .services import async_setup_services
+from .services import ATTR_COVERS
+from .services import DEFAULT_MAX_CONCURRENCY
+from .services import PROVISION_COVER_SCHEMA
 
 _LOGGER = logging.getLogger(__name__)
 
+# The covers are config entries. The optional YAML key sets the integration
+# up without any, for the provision service, and can carry a first manifest.
+CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(DOMAIN): vol.Any(
+            None,
+            vol.Schema(
+                {
+                    vol.Optional(ATTR_COVERS): vol.All(
+                        cv.ensure_list, [PROVISION_COVER_SCHEMA]
+                    )
+                }
+            ),
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the integration services."""
+    async_setup_services(hass)
+    setup_times = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_SETUP_TIMES, {})
+
+    @callback
+    def async_report_setup_times(hass: HomeAssistant) -> None:
+        """Log the time the config entries took to set up at startup."""
+        if not setup_times:
+            return
+        _LOGGER.info(
+            "Set up %d covers, %.1fms spent in their setup, slowest %.1fms",
+            len(setup_times),
+            sum(setup_times.values()) * 1000,
+            max(setup_times.values()) * 1000,
+        )
+
+    async_at_started(hass, async_report_setup_times)
+
+    if covers := (config.get(DOMAIN) or {}).get(ATTR_COVERS):
+
+        async def async_import_manifest(hass: HomeAssistant) -> None:
+            """Create the covers of the YAML manifest, the relays exist by now."""
+            try:
+                await async_provision_covers(hass, covers, DEFAULT_MAX_CONCURRENCY)
+            except ServiceValidationError as err:
+                _LOGGER.error("%s", err)
+
+        async_at_started(hass, async_import_manifest)
+    return True
+
 
 @callback
 def async_add_to_device(
@@ -46,18 +111,28 @@ def async_add_to_device(
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Check light-swich up and down exist."""
+    start = hass.loop.time()
     registry = er.async_get(hass)
     device_registry = dr.async_get(hass)
     try:
-        for entity in [CONF_ENTITY_UP, CONF_ENTITY_DOWN]:
-            entity_id = er.async_validate_entity_id(registry, entry.options[entity])
-    except vol.Invalid:
+        # Resolved once here, the platforms use the cached entity ids
+        wiring = async_resolve_wiring(hass, entry.options)
+    except vol.Invalid as err:
         # The entity is identified by an unknown entity registry ID
         _LOGGER.error(
-            "Failed to setup cover_time_based for unknown entity %s",
-            entry.options[entity],
+            "Failed to setup cover_time_based for unknown entity: %s",
+            err,
         )
         return False
+    entity_id = wiring[CONF_ENTITY_DOWN]
+    wirings = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_WIRING, {})
+    wirings[entry.entry_id] = wiring
+
+    @callback
+    def async_forget_wiring() -> None:
+        wirings.pop(entry.entry_id, None)
+
+    entry.async_on_unload(async_forget_wiring)
 
     async def async_registry_updated(
         event: Event[er.EventEntityRegistryUpdatedData],
@@ -90,26 +165,38 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             )
 
     entry.async_on_unload(
-        async_track_entity_registry_updated_event(
-            hass, entity_id, async_registry_updated
+        async_get_registry_dispatcher(hass).async_register(
+            entity_id, async_registry_updated
         )
     )
     entry.async_on_unload(entry.add_update_listener(config_entry_update_listener))
 
     device_id = async_add_to_device(hass, entry, entity_id)
 
-    await hass.config_entries.async_forward_entry_setups(entry, (COVER_DOMAIN, BUTTON_DOMAIN))
+    await hass.config_entries.async_forward_entry_setups(
+        entry, (COVER_DOMAIN, BUTTON_DOMAIN)
+    )
+    setup_time = hass.loop.time() - start
+    hass.data[DOMAIN][DATA_SETUP_TIMES][entry.entry_id] = setup_time
+    _LOGGER.debug("Set up %s in %.1fms", entry.title, setup_time * 1000)
     return True
 
 
 async def config_entry_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Update listener, called when the config entry options are changed."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Update listener, called when the config entry options are changed.
+
+    Travel times and tuning are applied to the running cover, the entry is
+    only reloaded when the cover is wired to other entities.
+    """
+    if not async_apply_options(hass, entry):
+        await hass.config_entries.async_reload(entry.entry_id)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, (COVER_DOMAIN, BUTTON_DOMAIN))
+    return await hass.config_entries.async_unload_platforms(
+        entry, (COVER_DOMAIN, BUTTON_DOMAIN)
+    )
 
 
 async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
@@ -118,6 +205,9 @@ async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     This will unhide the wrapped entity and restore assistant expose
     settings.
     """
+    learner = await async_get_learner(hass)
+    learner.async_remove(generate_unique_id(entry.title))
+
     registry = er.async_get(hass)
     try:
         switch_entity_id = er.async_validate_entity_id(
@@ -8,11 +8,15 @@ import asyncio
 from homeassistant.components.button import ButtonEntity
 from homeassistant.components.cover import DOMAIN as COVER_DOMAIN
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import slugify
 
+from .const import DOMAIN
+from .services import async_get_covers
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -59,6 +63,10 @@ class CalibrateButton(ButtonEntity):
         """Use the open entity for a while then assume the cover is fully open."""
         _LOGGER.debug("do_calibrate press")
 
-        self.hass.bus.async_fire("cover_time_based_calibrate", {
-            ATTR_ENTITY_ID: self.cover_id
-        })
+        entity_id = er.async_get(self.hass).async_get_entity_id(
+            COVER_DOMAIN, DOMAIN, self.cover_id
+        )
+        if (cover := async_get_covers(self.hass).get(entity_id)) is None:
+            raise HomeAssistantError(f"Cover {self.cover_id} is not loaded")
+        # A calibration runs a whole travel, the press returns right away
+        cover.async_start_calibration()
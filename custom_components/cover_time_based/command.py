@@ -0,0 +1,184 @@
+"""Relay command pipeline for the Cover Time-based integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+
+from homeassistant.const import Platform
+from homeassistant.const import SERVICE_CLOSE_COVER
+from homeassistant.const import SERVICE_OPEN_COVER
+from homeassistant.const import SERVICE_STOP_COVER
+from homeassistant.const import STATE_OFF
+from homeassistant.const import STATE_ON
+from homeassistant.core import callback
+from homeassistant.core import Context
+from homeassistant.core import HomeAssistant
+from homeassistant.core import State
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+# Weight of a new sample in the measured actuator latencies
+LATENCY_SMOOTHING = 0.3
+
+# Number of issued service calls whose echoes are still expected
+CONTEXT_HISTORY = 32
+
+LATENCY_START = "start"
+LATENCY_STOP = "stop"
+
+
+class CommandPipeline:
+    """Send open/close/stop commands to the wired relays.
+
+    Releasing relays is independent and happens concurrently. The only
+    ordering that is kept is the one that matters for the motor: the
+    opposite relay is off before the target relay is switched on.
+
+    Every service call gets its own Context, which Home Assistant passes on
+    to the state changes it causes. That tells the echoes of our commands
+    apart from presses at the wall, however late the relay reports. As an
+    entity keeps reusing its last context for a few seconds, only the state
+    change of the entity to the commanded state is an echo, and only once.
+
+    It also measures the actuator latencies from the relay state changes
+    that follow its commands: how long a relay takes to report on after a
+    move was commanded, and off after a stop was commanded.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        open_switch_entity_id: str,
+        close_switch_entity_id: str,
+        stop_switch_entity_id: str | None = None,
+    ) -> None:
+        """Initialize the pipeline."""
+        self.hass = hass
+        self.open_switch_entity_id = open_switch_entity_id
+        self.close_switch_entity_id = close_switch_entity_id
+        self.stop_switch_entity_id = stop_switch_entity_id
+        self.latencies: dict[str, float] = {}
+        self.start_delay: float | None = None
+        self.stop_run_on: float | None = None
+        # Loop time the last start command was issued at, the start delay
+        # is measured from there.
+        self.started_at: float | None = None
+        # Same for the last stop command and the run-on
+        self.stopped_at: float | None = None
+        self._expected: dict[str, tuple[str, str, datetime]] = {}
+        # Entity and state each of our service calls should report back
+        self._contexts: dict[str, tuple[str, str]] = {}
+
+    async def async_set_entity(
+        self,
+        state: str,
+        entity_id: str,
+        wait: bool = False,
+        measure: str | None = None,
+    ) -> None:
+        """Turn a relay on or off."""
+        if state not in [STATE_ON, STATE_OFF]:
+            raise Exception(f"calling set_entity with wrong state {state}")
+
+        domain = "homeassistant"
+        action = f"turn_{state}"
+
+        if entity_id.startswith(Platform.BUTTON):
+            domain = "input_button"
+            action = "press"
+        elif entity_id.startswith("script"):
+            domain = "script"
+
+        context = Context()
+        self._contexts[context.id] = (entity_id, state)
+        if len(self._contexts) > CONTEXT_HISTORY:
+            del self._contexts[next(iter(self._contexts))]
+
+        if measure is not None:
+            self._expected[entity_id] = (state, measure, dt_util.utcnow())
+        if measure == LATENCY_START:
+            self.started_at = self.hass.loop.time()
+        elif measure == LATENCY_STOP:
+            self.stopped_at = self.hass.loop.time()
+        await self.hass.services.async_call(
+            domain, action, {"entity_id": entity_id}, wait, context
+        )
+
+    @callback
+    def is_echo(self, state: State) -> bool:
+        """Return if state was caused by one of our own service calls."""
+        if self._contexts.get(state.context.id) != (state.entity_id, state.state):
+            return False
+        # A later change carrying the same context is someone else's
+        del self._contexts[state.context.id]
+        return True
+
+    async def async_send(self, command: str) -> float:
+        """Send command to the relays and return how long it took."""
+        start = self.hass.loop.time()
+
+        if command == SERVICE_CLOSE_COVER:
+            await self._async_switch_to(
+                self.close_switch_entity_id, self.open_switch_entity_id
+            )
+        elif command == SERVICE_OPEN_COVER:
+            await self._async_switch_to(
+                self.open_switch_entity_id, self.close_switch_entity_id
+            )
+        elif command == SERVICE_STOP_COVER:
+            await asyncio.gather(
+                self.async_set_entity(
+                    STATE_OFF, self.close_switch_entity_id, True, LATENCY_STOP
+                ),
+                self.async_set_entity(
+                    STATE_OFF, self.open_switch_entity_id, True, LATENCY_STOP
+                ),
+            )
+            if self.stop_switch_entity_id is not None:
+                await self.async_set_entity(STATE_ON, self.stop_switch_entity_id, True)
+
+        latency = self.hass.loop.time() - start
+        self.latencies[command] = latency
+        _LOGGER.debug("async_send :: %s took %.1fms", command, latency * 1000)
+        return latency
+
+    async def _async_switch_to(self, target: str, opposite: str) -> None:
+        """Release the opposite and stop relays, then switch target on."""
+        releases = [self.async_set_entity(STATE_OFF, opposite, True)]
+        if self.stop_switch_entity_id is not None:
+            releases.append(
+                self.async_set_entity(STATE_OFF, self.stop_switch_entity_id, True)
+            )
+        await asyncio.gather(*releases)
+        await self.async_set_entity(STATE_ON, target, True, LATENCY_START)
+
+    @callback
+    def async_observe(self, entity_id: str, old_state: State, new_state: State) -> None:
+        """Measure the latency of a relay reporting a commanded state."""
+        if (expected := self._expected.get(entity_id)) is None:
+            return
+        state, measure, issued_at = expected
+        if new_state.state != state:
+            return
+        del self._expected[entity_id]
+        if old_state.state == state:
+            return
+
+        sample = max(0.0, (new_state.last_changed - issued_at).total_seconds())
+        if measure == LATENCY_START:
+            self.start_delay = _smooth(self.start_delay, sample)
+        else:
+            self.stop_run_on = _smooth(self.stop_run_on, sample)
+        _LOGGER.debug(
+            "async_observe :: %s %s latency: %.1fms", entity_id, measure, sample * 1000
+        )
+
+
+def _smooth(average: float | None, sample: float) -> float:
+    """Fold a sample into an exponential moving average."""
+    if average is None:
+        return sample
+    return average + LATENCY_SMOOTHING * (sample - average)
@@ -8,19 +8,114 @@ from typing import Any
 import voluptuous as vol
 from homeassistant.const import CONF_NAME
 from homeassistant.const import Platform
+from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers import selector
+from homeassistant.helpers.schema_config_entry_flow import SchemaCommonFlowHandler
 from homeassistant.helpers.schema_config_entry_flow import SchemaConfigFlowHandler
+from homeassistant.helpers.schema_config_entry_flow import SchemaFlowError
 from homeassistant.helpers.schema_config_entry_flow import SchemaFlowFormStep
 
+from .const import CONF_APPLY_LEARNED_TIMES
+from .const import CONF_AUTO_LATENCY
+from .const import CONF_CALIBRATE_ON_FULL_TRAVEL
+from .const import CONF_CALIBRATION_OVERRUN
+from .const import CONF_CLOSED_SENSOR
+from .const import CONF_COALESCE_WINDOW
+from .const import CONF_DRIFT_BUDGET
 from .const import CONF_ENTITY_DOWN
 from .const import CONF_ENTITY_STOP
 from .const import CONF_ENTITY_UP
+from .const import CONF_OPEN_SENSOR
+from .const import CONF_POSITION_SENSOR
+from .const import CONF_POWER_GROUP
+from .const import CONF_POWER_GROUP_MAX
+from .const import CONF_POWER_MIN_RUNTIME
+from .const import CONF_POWER_SENSOR
+from .const import CONF_POWER_THRESHOLD
+from .const import CONF_START_DELAY
+from .const import CONF_STOP_RUN_ON
 from .const import CONF_TIME_CLOSE
 from .const import CONF_TIME_OPEN
+from .const import CONF_TRAVEL_CURVE_CLOSE
+from .const import CONF_TRAVEL_CURVE_OPEN
+from .const import CONF_UPDATE_INTERVAL
+from .const import CONF_UPDATE_MODE
+from .const import CONF_UPDATE_THRESHOLD
+from .const import DEFAULT_CALIBRATION_OVERRUN
+from .const import DEFAULT_COALESCE_WINDOW
+from .const import DEFAULT_DRIFT_BUDGET
+from .const import DEFAULT_POWER_GROUP_MAX
+from .const import DEFAULT_POWER_MIN_RUNTIME
+from .const import DEFAULT_POWER_THRESHOLD
+from .const import DEFAULT_START_DELAY
+from .const import DEFAULT_STOP_RUN_ON
+from .const import DEFAULT_UPDATE_INTERVAL
+from .const import DEFAULT_UPDATE_MODE
+from .const import DEFAULT_UPDATE_THRESHOLD
 from .const import DOMAIN
+from .const import UPDATE_MODE_ETA
+from .const import UPDATE_MODE_INTERVAL
+from .travelcurve import TravelCurve
 
 DOMAIN_ENTITIES_ALLOWED = [Platform.SWITCH, Platform.LIGHT, Platform.BUTTON, "script"]
+END_STOP_SENSOR_DOMAINS = [Platform.BINARY_SENSOR, "input_boolean"]
+POSITION_SENSOR_DOMAINS = [Platform.SENSOR, "input_number"]
+
+LATENCY_SCHEMA = {
+    vol.Optional(
+        CONF_START_DELAY, default=DEFAULT_START_DELAY
+    ): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            mode=selector.NumberSelectorMode.BOX,
+            min=0,
+            max=10,
+            step="any",
+            unit_of_measurement="sec",
+        )
+    ),
+    vol.Optional(
+        CONF_STOP_RUN_ON, default=DEFAULT_STOP_RUN_ON
+    ): selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            mode=selector.NumberSelectorMode.BOX,
+            min=0,
+            max=10,
+            step="any",
+            unit_of_measurement="sec",
+        )
+    ),
+}
+
+FEEDBACK_SCHEMA = {
+    vol.Optional(CONF_OPEN_SENSOR): selector.EntitySelector(
+        selector.EntitySelectorConfig(domain=END_STOP_SENSOR_DOMAINS)
+    ),
+    vol.Optional(CONF_CLOSED_SENSOR): selector.EntitySelector(
+        selector.EntitySelectorConfig(domain=END_STOP_SENSOR_DOMAINS)
+    ),
+    vol.Optional(CONF_POSITION_SENSOR): selector.EntitySelector(
+        selector.EntitySelectorConfig(domain=POSITION_SENSOR_DOMAINS)
+    ),
+    vol.Optional(CONF_POWER_SENSOR): selector.EntitySelector(
+        selector.EntitySelectorConfig(domain=POSITION_SENSOR_DOMAINS)
+    ),
+}
+
+
+async def validate_travel_curves(
+    handler: SchemaCommonFlowHandler, user_input: dict[str, Any]
+) -> dict[str, Any]:
+    """Validate the travel curves."""
+    for key in (CONF_TRAVEL_CURVE_OPEN, CONF_TRAVEL_CURVE_CLOSE):
+        if not user_input.get(key):
+            continue
+        try:
+            TravelCurve(user_input[key])
+        except (TypeError, ValueError) as err:
+            raise SchemaFlowError("invalid_travel_curve") from err
+    return user_input
+
 
 CONFIG_FLOW = {
     "user": SchemaFlowFormStep(
@@ -53,6 +148,8 @@ CONFIG_FLOW = {
                         unit_of_measurement="sec",
                     )
                 ),
+                **LATENCY_SCHEMA,
+                **FEEDBACK_SCHEMA,
             }
         )
     )
@@ -79,8 +176,118 @@ OPTIONS_FLOW = {
                         unit_of_measurement="sec",
                     )
                 ),
+                **LATENCY_SCHEMA,
+                vol.Optional(
+                    CONF_AUTO_LATENCY, default=False
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_CALIBRATION_OVERRUN, default=DEFAULT_CALIBRATION_OVERRUN
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        mode=selector.NumberSelectorMode.BOX,
+                        min=0,
+                        max=200,
+                        step=1,
+                        unit_of_measurement="%",
+                    )
+                ),
+                vol.Optional(
+                    CONF_CALIBRATE_ON_FULL_TRAVEL, default=False
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_DRIFT_BUDGET, default=DEFAULT_DRIFT_BUDGET
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        mode=selector.NumberSelectorMode.BOX,
+                        min=0,
+                        max=100,
+                        step="any",
+                        unit_of_measurement="%",
+                    )
+                ),
+                **FEEDBACK_SCHEMA,
+                vol.Optional(
+                    CONF_POWER_THRESHOLD, default=DEFAULT_POWER_THRESHOLD
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        mode=selector.NumberSelectorMode.BOX,
+                        min=0,
+                        max=1000,
+                        step="any",
+                        unit_of_measurement="W",
+                    )
+                ),
+                vol.Optional(
+                    CONF_POWER_MIN_RUNTIME, default=DEFAULT_POWER_MIN_RUNTIME
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        mode=selector.NumberSelectorMode.BOX,
+                        min=0,
+                        max=30,
+                        step="any",
+                        unit_of_measurement="sec",
+                    )
+                ),
+                vol.Optional(
+                    CONF_APPLY_LEARNED_TIMES, default=False
+                ): selector.BooleanSelector(),
+                vol.Optional(CONF_TRAVEL_CURVE_OPEN): selector.ObjectSelector(),
+                vol.Optional(CONF_TRAVEL_CURVE_CLOSE): selector.ObjectSelector(),
+                vol.Optional(
+                    CONF_UPDATE_MODE, default=DEFAULT_UPDATE_MODE
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[UPDATE_MODE_INTERVAL, UPDATE_MODE_ETA],
+                        translation_key=CONF_UPDATE_MODE,
+                    )
+                ),
+                vol.Optional(
+                    CONF_UPDATE_INTERVAL, default=DEFAULT_UPDATE_INTERVAL
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        mode=selector.NumberSelectorMode.BOX,
+                        min=0,
+                        max=60,
+                        step="any",
+                        unit_of_measurement="sec",
+                    )
+                ),
+                vol.Optional(
+                    CONF_UPDATE_THRESHOLD, default=DEFAULT_UPDATE_THRESHOLD
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        mode=selector.NumberSelectorMode.BOX,
+                        min=1,
+                        max=100,
+                        step=1,
+                        unit_of_measurement="%",
+                    )
+                ),
+                vol.Optional(
+                    CONF_COALESCE_WINDOW, default=DEFAULT_COALESCE_WINDOW
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        mode=selector.NumberSelectorMode.BOX,
+                        min=0,
+                        max=5,
+                        step="any",
+                        unit_of_measurement="sec",
+                    )
+                ),
+                vol.Optional(CONF_POWER_GROUP): selector.TextSelector(),
+                vol.Optional(
+                    CONF_POWER_GROUP_MAX, default=DEFAULT_POWER_GROUP_MAX
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        mode=selector.NumberSelectorMode.BOX,
+                        min=1,
+                        max=50,
+                        step=1,
+                    )
+                ),
             }
-        )
+        ),
+        validate_user_input=validate_travel_curves,
     ),
 }
 
@@ -94,6 +301,11 @@ class CoverTimeBasedConfigFlowHandler(SchemaConfigFlowHandler, domain=DOMAIN):
     VERSION = 1
     MINOR_VERSION = 3
 
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Create an entry from a cover of a provisioning manifest."""
+        self._async_abort_entries_match({CONF_NAME: import_data[CONF_NAME]})
+        return self.async_create_entry(data=import_data)
+
     def async_config_entry_title(self, options: Mapping[str, Any]) -> str:
         """Return config entry title and hide the wrapped entity if
         registered."""
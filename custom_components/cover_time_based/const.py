@@ -5,9 +5,75 @@ from typing import Final
 DOMAIN: Final = "cover_time_based"
 
 SERVICE_CALIBRATE: Final = "cover_calibrate"
+SERVICE_SET_POSITIONS: Final = "set_positions"
+SERVICE_PROVISION: Final = "provision"
 
 CONF_ENTITY_UP: Final = "up"
 CONF_ENTITY_DOWN: Final = "down"
 CONF_ENTITY_STOP: Final = "stop"
 CONF_TIME_OPEN: Final = "time_open"
 CONF_TIME_CLOSE: Final = "time_close"
+CONF_UPDATE_INTERVAL: Final = "update_interval"
+CONF_UPDATE_THRESHOLD: Final = "update_threshold"
+CONF_UPDATE_MODE: Final = "update_mode"
+CONF_START_DELAY: Final = "start_delay"
+CONF_STOP_RUN_ON: Final = "stop_run_on"
+CONF_AUTO_LATENCY: Final = "auto_latency"
+CONF_TRAVEL_CURVE_OPEN: Final = "travel_curve_open"
+CONF_TRAVEL_CURVE_CLOSE: Final = "travel_curve_close"
+CONF_POWER_GROUP: Final = "power_group"
+CONF_POWER_GROUP_MAX: Final = "power_group_max"
+CONF_COALESCE_WINDOW: Final = "coalesce_window"
+CONF_CALIBRATION_OVERRUN: Final = "calibration_overrun"
+CONF_CALIBRATE_ON_FULL_TRAVEL: Final = "calibrate_on_full_travel"
+CONF_DRIFT_BUDGET: Final = "drift_budget"
+CONF_OPEN_SENSOR: Final = "open_sensor"
+CONF_CLOSED_SENSOR: Final = "closed_sensor"
+CONF_POSITION_SENSOR: Final = "position_sensor"
+CONF_POWER_SENSOR: Final = "power_sensor"
+CONF_POWER_THRESHOLD: Final = "power_threshold"
+CONF_POWER_MIN_RUNTIME: Final = "power_min_runtime"
+CONF_APPLY_LEARNED_TIMES: Final = "apply_learned_travel_times"
+
+UPDATE_MODE_INTERVAL: Final = "interval"
+UPDATE_MODE_ETA: Final = "eta"
+
+DEFAULT_UPDATE_INTERVAL: Final = 1.0
+DEFAULT_UPDATE_THRESHOLD: Final = 1
+DEFAULT_UPDATE_MODE: Final = UPDATE_MODE_INTERVAL
+DEFAULT_START_DELAY: Final = 0.0
+DEFAULT_STOP_RUN_ON: Final = 0.0
+DEFAULT_POWER_GROUP_MAX: Final = 2
+DEFAULT_COALESCE_WINDOW: Final = 0.0
+DEFAULT_CALIBRATION_OVERRUN: Final = 50
+DEFAULT_DRIFT_BUDGET: Final = 0
+DEFAULT_POWER_THRESHOLD: Final = 5.0
+DEFAULT_POWER_MIN_RUNTIME: Final = 1.5
+
+DATA_DISPATCHER: Final = "dispatcher"
+DATA_MOTION: Final = "motion"
+DATA_FLEET: Final = "fleet"
+DATA_COVERS: Final = "covers"
+DATA_POWER: Final = "power"
+DATA_LEARNING: Final = "learning"
+DATA_INTENTS: Final = "intents"
+DATA_WIRING: Final = "wiring"
+DATA_REGISTRY_DISPATCHER: Final = "registry_dispatcher"
+DATA_SETUP_TIMES: Final = "setup_times"
+
+ATTR_STOP_JITTER: Final = "stop_jitter"
+ATTR_COMMAND_LATENCY: Final = "command_latency"
+ATTR_MEASURED_START_DELAY: Final = "measured_start_delay"
+ATTR_MEASURED_STOP_RUN_ON: Final = "measured_stop_run_on"
+ATTR_TRAVEL_START_POSITION: Final = "travel_start_position"
+ATTR_TRAVEL_TARGET_POSITION: Final = "travel_target_position"
+ATTR_TRAVEL_STARTED_AT: Final = "travel_started_at"
+ATTR_TRAVEL_ETA: Final = "travel_eta"
+ATTR_POWER_QUEUE_DEPTH: Final = "power_queue_depth"
+ATTR_POWER_WAIT: Final = "power_wait"
+ATTR_COALESCED_COMMANDS: Final = "coalesced_commands"
+ATTR_DROPPED_COMMANDS: Final = "dropped_commands"
+ATTR_POSITION_UNCERTAINTY: Final = "position_uncertainty"
+ATTR_POWER_DETECTION_LATENCY: Final = "power_detection_latency"
+ATTR_LEARNED_TIME_OPEN: Final = "learned_time_open"
+ATTR_LEARNED_TIME_CLOSE: Final = "learned_time_close"
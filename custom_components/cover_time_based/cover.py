@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-import time
 import asyncio
 import logging
-from datetime import timedelta
+from contextlib import nullcontext
+from contextlib import suppress
 from functools import wraps
 
 from homeassistant.components.cover import ATTR_CURRENT_POSITION
@@ -14,7 +14,6 @@ from homeassistant.components.cover import CoverEntity
 from homeassistant.components.cover import DOMAIN as COVER_DOMAIN
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_ENTITY_ID
-from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.const import Platform
 from homeassistant.const import SERVICE_CLOSE_COVER
 from homeassistant.const import SERVICE_OPEN_COVER
@@ -29,21 +28,95 @@ from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util import dt as dt_util
 from homeassistant.util import slugify
 from homeassistant.exceptions import ServiceValidationError
 
+from .command import CommandPipeline
+from .const import ATTR_COALESCED_COMMANDS
+from .const import ATTR_COMMAND_LATENCY
+from .const import ATTR_DROPPED_COMMANDS
+from .const import ATTR_LEARNED_TIME_CLOSE
+from .const import ATTR_LEARNED_TIME_OPEN
+from .const import ATTR_MEASURED_START_DELAY
+from .const import ATTR_MEASURED_STOP_RUN_ON
+from .const import ATTR_POSITION_UNCERTAINTY
+from .const import ATTR_POWER_DETECTION_LATENCY
+from .const import ATTR_POWER_QUEUE_DEPTH
+from .const import ATTR_POWER_WAIT
+from .const import ATTR_STOP_JITTER
+from .const import ATTR_TRAVEL_ETA
+from .const import ATTR_TRAVEL_START_POSITION
+from .const import ATTR_TRAVEL_STARTED_AT
+from .const import ATTR_TRAVEL_TARGET_POSITION
+from .const import CONF_APPLY_LEARNED_TIMES
+from .const import CONF_AUTO_LATENCY
+from .const import CONF_CALIBRATE_ON_FULL_TRAVEL
+from .const import CONF_CALIBRATION_OVERRUN
+from .const import CONF_CLOSED_SENSOR
+from .const import CONF_COALESCE_WINDOW
+from .const import CONF_DRIFT_BUDGET
 from .const import CONF_ENTITY_DOWN
 from .const import CONF_ENTITY_STOP
 from .const import CONF_ENTITY_UP
+from .const import CONF_OPEN_SENSOR
+from .const import CONF_POSITION_SENSOR
+from .const import CONF_POWER_GROUP
+from .const import CONF_POWER_GROUP_MAX
+from .const import CONF_POWER_MIN_RUNTIME
+from .const import CONF_POWER_SENSOR
+from .const import CONF_POWER_THRESHOLD
+from .const import CONF_START_DELAY
+from .const import CONF_STOP_RUN_ON
 from .const import CONF_TIME_CLOSE
 from .const import CONF_TIME_OPEN
+from .const import CONF_TRAVEL_CURVE_CLOSE
+from .const import CONF_TRAVEL_CURVE_OPEN
+from .const import CONF_UPDATE_INTERVAL
+from .const import CONF_UPDATE_MODE
+from .const import CONF_UPDATE_THRESHOLD
+from .const import DATA_WIRING
+from .const import DEFAULT_CALIBRATION_OVERRUN
+from .const import DEFAULT_COALESCE_WINDOW
+from .const import DEFAULT_DRIFT_BUDGET
+from .const import DEFAULT_POWER_GROUP_MAX
+from .const import DEFAULT_POWER_MIN_RUNTIME
+from .const import DEFAULT_POWER_THRESHOLD
+from .const import DEFAULT_START_DELAY
+from .const import DEFAULT_STOP_RUN_ON
+from .const import DEFAULT_UPDATE_INTERVAL
+from .const import DEFAULT_UPDATE_MODE
+from .const import DEFAULT_UPDATE_THRESHOLD
+from .const import DOMAIN
+from .const import UPDATE_MODE_ETA
+from .dispatcher import async_get_dispatcher
+from .fleet import async_get_fleet
+from .intent import async_get_intents
+from .intent import TravelIntent
+from .learning import async_get_learner
+from .motion import async_get_motion_scheduler
+from .power import async_get_power_group
+from .services import async_get_covers
 from .travelcalculator import TravelCalculator
 from .travelcalculator import TravelStatus
+from .travelcurve import TravelCurve
 
 _LOGGER = logging.getLogger(__name__)
 
+WIRED_ENTITIES = (
+    CONF_ENTITY_UP,
+    CONF_ENTITY_DOWN,
+    CONF_ENTITY_STOP,
+    CONF_OPEN_SENSOR,
+    CONF_CLOSED_SENSOR,
+    CONF_POSITION_SENSOR,
+    CONF_POWER_SENSOR,
+)
+# Changing any of these rebuilds the cover, the other options are applied to
+# the running one.
+WIRED_OPTIONS = (*WIRED_ENTITIES, CONF_POWER_GROUP)
+
 
 async def async_get_device_entry_from_entity_id(
     hass: HomeAssistant, entity_id: str
@@ -78,34 +151,138 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Initialize Cover Switch config entry."""
-    registry = er.async_get(hass)
-
-    entity_up = er.async_validate_entity_id(
-        registry, config_entry.options[CONF_ENTITY_UP]
-    )
-    entity_down = er.async_validate_entity_id(
-        registry, config_entry.options[CONF_ENTITY_DOWN]
-    )
-    entity_stop = None
-    if config_entry.options.get(CONF_ENTITY_STOP):
-        entity_stop = er.async_validate_entity_id(
-            registry, config_entry.options[CONF_ENTITY_STOP]
-        )
+    # Resolved once when the entry was set up
+    wiring = hass.data[DOMAIN][DATA_WIRING][config_entry.entry_id]
 
     cover_id = generate_unique_id(config_entry.title)
 
+    power_group = None
+    if config_entry.options.get(CONF_POWER_GROUP):
+        power_group = async_get_power_group(
+            hass,
+            config_entry.options[CONF_POWER_GROUP],
+            int(
+                config_entry.options.get(CONF_POWER_GROUP_MAX, DEFAULT_POWER_GROUP_MAX)
+            ),
+        )
+
     cover = CoverTimeBased(
         cover_id,
         config_entry.title,
         config_entry.options.get(CONF_TIME_CLOSE),
         config_entry.options[CONF_TIME_OPEN],
-        entity_up,
-        entity_down,
-        entity_stop,
+        wiring[CONF_ENTITY_UP],
+        wiring[CONF_ENTITY_DOWN],
+        wiring.get(CONF_ENTITY_STOP),
+        clock=hass.loop.time,
+        power_group=power_group,
+        open_sensor_entity_id=wiring.get(CONF_OPEN_SENSOR),
+        closed_sensor_entity_id=wiring.get(CONF_CLOSED_SENSOR),
+        position_sensor_entity_id=wiring.get(CONF_POSITION_SENSOR),
+        power_sensor_entity_id=wiring.get(CONF_POWER_SENSOR),
+        **tuning_options(config_entry.options),
     )
+    cover.wiring = wired_options(config_entry.options)
 
     async_add_entities([cover])
 
+
+@callback
+def async_resolve_wiring(hass: HomeAssistant, options) -> dict[str, str]:
+    """Return the entity ids of the wired entities, raise vol.Invalid if unknown."""
+    registry = er.async_get(hass)
+    return {
+        key: er.async_validate_entity_id(registry, options[key])
+        for key in WIRED_ENTITIES
+        if options.get(key)
+    }
+
+
+def wired_options(options) -> dict:
+    """Return the options that need a reload of the entry to change."""
+    return {key: options.get(key) for key in WIRED_OPTIONS}
+
+
+def tuning_options(options) -> dict:
+    """Return the options a running cover applies without a reload."""
+    return {
+        "update_interval": options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
+        "update_threshold": options.get(
+            CONF_UPDATE_THRESHOLD, DEFAULT_UPDATE_THRESHOLD
+        ),
+        "update_mode": options.get(CONF_UPDATE_MODE, DEFAULT_UPDATE_MODE),
+        "start_delay": options.get(CONF_START_DELAY, DEFAULT_START_DELAY),
+        "stop_run_on": options.get(CONF_STOP_RUN_ON, DEFAULT_STOP_RUN_ON),
+        "auto_latency": options.get(CONF_AUTO_LATENCY, False),
+        "travel_curve_down": build_travel_curve(options.get(CONF_TRAVEL_CURVE_CLOSE)),
+        "travel_curve_up": build_travel_curve(options.get(CONF_TRAVEL_CURVE_OPEN)),
+        "coalesce_window": options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW),
+        "calibration_overrun": options.get(
+            CONF_CALIBRATION_OVERRUN, DEFAULT_CALIBRATION_OVERRUN
+        ),
+        "calibrate_on_full_travel": options.get(CONF_CALIBRATE_ON_FULL_TRAVEL, False),
+        "drift_budget": options.get(CONF_DRIFT_BUDGET, DEFAULT_DRIFT_BUDGET),
+        "power_threshold": options.get(CONF_POWER_THRESHOLD, DEFAULT_POWER_THRESHOLD),
+        "power_min_runtime": options.get(
+            CONF_POWER_MIN_RUNTIME, DEFAULT_POWER_MIN_RUNTIME
+        ),
+        "apply_learned_times": options.get(CONF_APPLY_LEARNED_TIMES, False),
+    }
+
+
+@callback
+def async_apply_options(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
+    """Apply changed options to the running cover.
+
+    Return False when the entry has to be reloaded instead: the cover isn't
+    running, was renamed or is wired to other entities.
+    """
+    registry = er.async_get(hass)
+    covers = async_get_covers(hass)
+    cover = next(
+        (
+            covers[entry.entity_id]
+            for entry in er.async_entries_for_config_entry(
+                registry, config_entry.entry_id
+            )
+            if entry.entity_id in covers
+        ),
+        None,
+    )
+    if (
+        cover is None
+        or cover.unique_id != generate_unique_id(config_entry.title)
+        or cover.wiring != wired_options(config_entry.options)
+    ):
+        return False
+
+    if config_entry.options.get(CONF_POWER_GROUP):
+        async_get_power_group(
+            hass,
+            config_entry.options[CONF_POWER_GROUP],
+            int(
+                config_entry.options.get(CONF_POWER_GROUP_MAX, DEFAULT_POWER_GROUP_MAX)
+            ),
+        )
+    cover.async_update_tuning(
+        config_entry.options.get(CONF_TIME_CLOSE),
+        config_entry.options[CONF_TIME_OPEN],
+        **tuning_options(config_entry.options),
+    )
+    return True
+
+
+def build_travel_curve(points) -> TravelCurve | None:
+    """Compile the configured travel curve, None moves linearly."""
+    if not points:
+        return None
+    try:
+        return TravelCurve(points)
+    except (TypeError, ValueError) as err:
+        _LOGGER.warning("Ignoring invalid travel curve %s: %s", points, err)
+        return None
+
+
 def not_calibrating(func):
     if asyncio.iscoroutinefunction(func):
         @wraps(func)
@@ -134,6 +311,27 @@ class CoverTimeBased(CoverEntity, RestoreEntity):
         open_switch_entity_id,
         close_switch_entity_id,
         stop_switch_entity_id=None,
+        update_interval=DEFAULT_UPDATE_INTERVAL,
+        update_threshold=DEFAULT_UPDATE_THRESHOLD,
+        update_mode=DEFAULT_UPDATE_MODE,
+        clock=None,
+        start_delay=DEFAULT_START_DELAY,
+        stop_run_on=DEFAULT_STOP_RUN_ON,
+        auto_latency=False,
+        travel_curve_down=None,
+        travel_curve_up=None,
+        power_group=None,
+        coalesce_window=DEFAULT_COALESCE_WINDOW,
+        calibration_overrun=DEFAULT_CALIBRATION_OVERRUN,
+        calibrate_on_full_travel=False,
+        drift_budget=DEFAULT_DRIFT_BUDGET,
+        open_sensor_entity_id=None,
+        closed_sensor_entity_id=None,
+        position_sensor_entity_id=None,
+        power_sensor_entity_id=None,
+        power_threshold=DEFAULT_POWER_THRESHOLD,
+        power_min_runtime=DEFAULT_POWER_MIN_RUNTIME,
+        apply_learned_times=False,
     ):
         """Initialize the cover."""
         if not travel_time_down:
@@ -150,18 +348,119 @@ class CoverTimeBased(CoverEntity, RestoreEntity):
         self._attr_unique_id = unique_id
 
         self._unsubscribe_auto_updater = None
-
-        self._ignore_switch_updates_until = None
+        self._update_interval = update_interval
+        self._update_threshold = update_threshold
+        self._update_mode = update_mode
+        self._last_written_position = None
+        self._last_written_at = 0.0
+        self._unsubscribe_auto_stop = None
+        self._auto_stop_deadline = None
+        self._last_stop_jitter = None
+        self._last_command_latency = None
+        self._pipeline = None
+        self._power_group = power_group
+        self._last_power_wait = None
+        self._coalesce_window = coalesce_window
+        self._coalesced_move = None
+        self._coalesced_position = None
+        self._coalesced_commands = 0
+        self._dropped_commands = 0
+        self._calibration_overrun = calibration_overrun / 100
+        self._calibrate_on_full_travel = calibrate_on_full_travel
+        self._drift_budget = drift_budget
+        self._recalibration = None
+        self._recalibration_return = False
+        self._open_sensor_entity_id = open_sensor_entity_id
+        self._closed_sensor_entity_id = closed_sensor_entity_id
+        self._position_sensor_entity_id = position_sensor_entity_id
+        self._end_stop_reached = asyncio.Event()
+        self._calibrating_to = None
+        self._power_sensor_entity_id = power_sensor_entity_id
+        self._power_threshold = power_threshold
+        self._power_min_runtime = power_min_runtime
+        self._motor_started_at = None
+        self._run_started_at = None
+        self._last_power_detection_latency = None
+        self._power_drop_at = None
+        self._apply_learned_times = apply_learned_times
+        self._learner = None
+        self._run_from = None
+        self._intents = None
+        self.wiring = None
+
+        self._auto_latency = auto_latency
 
         self.is_calibrating = False
-        self.tc = TravelCalculator(self._travel_time_down, self._travel_time_up)
+        self.tc = TravelCalculator(
+            self._travel_time_down,
+            self._travel_time_up,
+            start_delay=start_delay,
+            stop_run_on=stop_run_on,
+            travel_curve_down=travel_curve_down,
+            travel_curve_up=travel_curve_up,
+        )
+        if clock is not None:
+            self.tc.clock = clock
+        self._snapshot = None
+        self._wall_clock_offset = 0.0
+        self._fleet = None
+        self._fleet_slot = None
+        self._tasks = set()
 
     async def async_added_to_hass(self):
         """Only cover's position matters."""
         """The rest is calculated from this attribute."""
-        # Listen to all change events, look for switch/light press
-        self.hass.bus.async_listen(EVENT_STATE_CHANGED, self._handle_state_changed)
-        self.hass.bus.async_listen("cover_time_based_calibrate", self._do_calibrate)
+        # Nothing may outlive the entity, or every reload would leave timers
+        # and tasks behind.
+        self.async_on_remove(self._async_cancel_pending)
+        self._pipeline = CommandPipeline(
+            self.hass,
+            self._open_switch_entity_id,
+            self._close_switch_entity_id,
+            self._stop_switch_entity_id,
+        )
+        self._fleet = async_get_fleet(self.hass)
+        self._fleet_slot = self._fleet.async_register(self.tc)
+        self.async_on_remove(lambda: self._fleet.async_unregister(self._fleet_slot))
+        # Only listen to change events of our own switches/lights
+        self.async_on_remove(
+            async_get_dispatcher(self.hass).async_register(
+                [
+                    self._open_switch_entity_id,
+                    self._close_switch_entity_id,
+                    self._stop_switch_entity_id,
+                ],
+                self._handle_state_changed,
+            )
+        )
+        feedback_entity_ids = [
+            entity_id
+            for entity_id in (
+                self._open_sensor_entity_id,
+                self._closed_sensor_entity_id,
+                self._position_sensor_entity_id,
+                self._power_sensor_entity_id,
+            )
+            if entity_id is not None
+        ]
+        if feedback_entity_ids:
+            self.async_on_remove(
+                async_get_dispatcher(self.hass).async_register(
+                    feedback_entity_ids, self._handle_feedback_changed
+                )
+            )
+        self._learner = await async_get_learner(self.hass)
+        self._intents = await async_get_intents(self.hass)
+        if self._apply_learned_times:
+            self._async_apply_learned_times()
+        covers = async_get_covers(self.hass)
+        covers[self.entity_id] = self
+        self.async_on_remove(lambda: covers.pop(self.entity_id, None))
+        if self._power_group is not None:
+            self.async_on_remove(
+                self._power_group.async_add_member(self, self.async_write_ha_state)
+            )
+            self.async_on_remove(lambda: self._power_group.async_release(self))
         old_state = await self.async_get_last_state()
         _LOGGER.debug("async_added_to_hass :: oldState %s", old_state)
         if (
@@ -170,46 +469,358 @@ class CoverTimeBased(CoverEntity, RestoreEntity):
             and old_state.attributes.get(ATTR_CURRENT_POSITION) is not None
         ):
             self.tc.set_position(int(old_state.attributes.get(ATTR_CURRENT_POSITION)))
+            if old_state.attributes.get(ATTR_POSITION_UNCERTAINTY) is not None:
+                self.tc.restore_uncertainty(
+                    float(old_state.attributes.get(ATTR_POSITION_UNCERTAINTY))
+                )
+        self._async_recover_travel()
 
-    @not_calibrating
-    async def _do_calibrate(self, event):
-        """Use the open entity for a while then assume the cover is fully open."""
-
-        if event.data.get(ATTR_ENTITY_ID) != self._attr_unique_id:
+    @callback
+    def _async_recover_travel(self):
+        """Continue or finish a travel interrupted by a restart."""
+        if (intent := self._intents.get(self._attr_unique_id)) is None:
             return
+        elapsed = max(0.0, dt_util.utcnow().timestamp() - intent["started"])
+        self.tc.set_position(intent["position"])
+        self.tc.start_travel(intent["target"], self.tc.clock() - elapsed)
+        if self.tc.position_reached():
+            _LOGGER.info(
+                "%s: travel interrupted %.0fs ago has finished, stopping",
+                self._name,
+                elapsed,
+            )
+            self._async_create_task(self.auto_stop_if_necessary())
+        else:
+            _LOGGER.info(
+                "%s: resuming travel interrupted %.0fs ago", self._name, elapsed
+            )
+            self.start_auto_updater()
+            self.schedule_auto_stop()
+
+    @callback
+    def async_start_calibration(self):
+        """Calibrate in the background, cancelled when the cover is removed."""
+        self._async_create_task(self.async_calibrate())
 
+    @not_calibrating
+    async def async_calibrate(self):
+        """Drive into the nearest end stop, then assume the cover is there."""
         _LOGGER.debug("do_calibrate")
         await self.check_availability()
         if not self.available:
             return
         self.stop_auto_updater()
+        self.cancel_auto_stop()
+        # A position still waiting in the coalescing window would move the
+        # cover in the middle of the calibration
+        self._cancel_coalesced_move()
+
+        position = self.tc.current_position()
+        if position is None:
+            # Nothing known, give it the time of a full travel
+            command = SERVICE_OPEN_COVER
+            end_stop = self.tc.position_closed
+            position = self.tc.position_open
+        elif position < (self.tc.position_open + self.tc.position_closed) / 2:
+            command = SERVICE_CLOSE_COVER
+            end_stop = self.tc.position_open
+        else:
+            command = SERVICE_OPEN_COVER
+            end_stop = self.tc.position_closed
+        if self._end_stop_sensor_on(end_stop):
+            _LOGGER.debug("do_calibrate :: already at end stop %d", end_stop)
+            self.tc.confirm_end_stop(end_stop)
+            self.async_write_ha_state()
+            return
+        run_time = self.tc.calculate_travel_time(
+            from_position=position, to_position=end_stop
+        ) + self._end_stop_overrun(end_stop)
+        _LOGGER.debug("do_calibrate :: to %d in %.1fs", end_stop, run_time)
+
         self.is_calibrating = True
+        self._calibrating_to = end_stop
+        self._end_stop_reached.clear()
         try:
-            await self._async_handle_command(SERVICE_OPEN_COVER)
+            if not await self._async_handle_command(command, position=end_stop):
+                return
+            self._intents.async_set(
+                self._attr_unique_id,
+                TravelIntent(
+                    position=position,
+                    target=end_stop,
+                    started=dt_util.utcnow().timestamp(),
+                ),
+            )
 
-            await asyncio.sleep(self._travel_time_up * 1.5)
-            self.tc.set_position(self.tc.position_closed)
+            # Cut short by the end stop sensors, if any
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._end_stop_reached.wait(), run_time)
+            self.tc.confirm_end_stop(end_stop)
 
         finally:
             self.is_calibrating = False
 
         await self._async_handle_command(SERVICE_STOP_COVER)
+        self.async_write_ha_state()
+
+    def _end_stop_sensor_on(self, end_stop):
+        """Return if the sensor of end_stop reports the cover is there."""
+        entity_id = (
+            self._open_sensor_entity_id
+            if end_stop == self.tc.position_closed
+            else self._closed_sensor_entity_id
+        )
+        return (
+            entity_id is not None
+            and (state := self.hass.states.get(entity_id)) is not None
+            and state.state == STATE_ON
+        )
+
+    async def _handle_feedback_changed(self, event):
+        """Resynchronize the position from the end stop and position sensors."""
+        entity_id = event.data.get(ATTR_ENTITY_ID)
+        new_state = event.data.get("new_state")
+        if new_state is None or new_state.state in [STATE_UNAVAILABLE, STATE_UNKNOWN]:
+            return
+
+        if entity_id == self._power_sensor_entity_id:
+            await self._async_power_changed(new_state)
+            return
+
+        if entity_id == self._position_sensor_entity_id:
+            try:
+                position = round(float(new_state.state))
+            except ValueError:
+                _LOGGER.warning(
+                    "%s: ignoring position %s of %s",
+                    self._name,
+                    new_state.state,
+                    entity_id,
+                )
+                return
+            position = max(0, min(100, position))
+            if self.is_calibrating:
+                if position == self._calibrating_to:
+                    self._end_stop_reached.set()
+                return
+            if position in (
+                self.tc.position_open,
+                self.tc.position_closed,
+            ) and self._heading_to(position):
+                await self._async_end_stop_reached(position)
+                return
+            _LOGGER.debug("_handle_feedback_changed :: position %d", position)
+            if self.tc.is_traveling() and self._reached_target(position):
+                # At or past the target already, stop where the sensor says
+                # the cover is instead of waiting for the computed arrival.
+                self.cancel_auto_stop()
+                self.stop_auto_updater()
+                self.tc.stop()
+                self.tc.confirm_position(position)
+                await self.auto_stop_if_necessary()
+                return
+            self.tc.confirm_position(position)
+            if self.tc.is_traveling():
+                # The arrival time moves with the corrected position
+                self.schedule_auto_stop()
+            self.async_write_ha_state()
+            return
+
+        if new_state.state != STATE_ON:
+            return
+        await self._async_end_stop_reached(
+            self.tc.position_closed
+            if entity_id == self._open_sensor_entity_id
+            else self.tc.position_open
+        )
+
+    async def _async_power_changed(self, state):
+        """Cut the relay once the motor stopped at its own limit switch."""
+        if self._motor_started_at is None:
+            return
+        try:
+            power = float(state.state)
+        except ValueError:
+            return
+        if (
+            power >= self._power_threshold
+            or self.hass.loop.time() - self._motor_started_at < self._power_min_runtime
+        ):
+            return
+
+        if self.is_calibrating:
+            end_stop = self._calibrating_to
+        elif self.tc.travel_direction == TravelStatus.DIRECTION_DOWN:
+            end_stop = self.tc.position_closed
+        else:
+            end_stop = self.tc.position_open
+        # The latency runs until the relay reports off
+        self._power_drop_at = state.last_updated
+        _LOGGER.debug(
+            "_async_power_changed :: %.1fW, motor stopped at %d", power, end_stop
+        )
+        await self._async_end_stop_reached(end_stop)
+
+    @callback
+    def _measure_power_cutoff(self, event):
+        """Time from the power drop to the relay reporting off."""
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        if (
+            self._power_drop_at is None
+            or old_state is None
+            or new_state is None
+            or old_state.state != STATE_ON
+            or new_state.state != STATE_OFF
+            or event.data.get(ATTR_ENTITY_ID)
+            not in (self._open_switch_entity_id, self._close_switch_entity_id)
+        ):
+            return
+        self._last_power_detection_latency = (
+            new_state.last_changed - self._power_drop_at
+        ).total_seconds()
+        self._power_drop_at = None
+        _LOGGER.debug(
+            "_measure_power_cutoff :: relay off %.1fms after the power drop",
+            self._last_power_detection_latency * 1000,
+        )
+
+    @callback
+    def _async_motor_started(self, commanded_at=None):
+        """Note when the motor started and whether from a known end stop."""
+        self._motor_started_at = self.hass.loop.time()
+        # A commanded run moves once the start delay after the command is up,
+        # at the wall the motor already runs when we hear about it
+        self._run_started_at = (
+            self._motor_started_at
+            if commanded_at is None
+            else commanded_at + self.tc.start_delay
+        )
+        self._power_drop_at = None
+        position = self.tc.current_position()
+        self._run_from = None
+        if self.tc.uncertainty() == 0 and position in (
+            self.tc.position_open,
+            self.tc.position_closed,
+        ):
+            self._run_from = position
+
+    @callback
+    def _async_learn_run(self, end_stop):
+        """Learn from a run between the two end stops that was just detected."""
+        if (
+            self._learner is None
+            or self._run_from is None
+            or self._run_from == end_stop
+            or self._run_started_at is None
+        ):
+            return
+        self._run_from = None
+        direction = (
+            "travel_time_down"
+            if end_stop == self.tc.position_closed
+            else "travel_time_up"
+        )
+        self._learner.async_add_sample(
+            self._attr_unique_id,
+            direction,
+            self.hass.loop.time() - self._run_started_at,
+        )
+        if self._apply_learned_times:
+            self._async_apply_learned_times()
+
+    @callback
+    def _async_apply_learned_times(self):
+        """Use the learned travel times that have converged."""
+        travel_time_down = self._learner.estimate(
+            self._attr_unique_id, "travel_time_down"
+        )
+        travel_time_up = self._learner.estimate(self._attr_unique_id, "travel_time_up")
+        self.tc.rebase()
+        if travel_time_down is not None:
+            self._travel_time_down = self.tc.travel_time_down = travel_time_down
+        if travel_time_up is not None:
+            self._travel_time_up = self.tc.travel_time_up = travel_time_up
+        self.tc.changed()
+
+    def _reached_target(self, position):
+        """Return if position is at or past the target of the travel."""
+        if self.tc.travel_direction == TravelStatus.DIRECTION_DOWN:
+            return position >= self.tc._travel_to_position
+        return position <= self.tc._travel_to_position
+
+    def _heading_to(self, end_stop):
+        """Return if the motor may be running towards end_stop."""
+        if self._unsubscribe_auto_stop is None:
+            return True
+        return self.tc.travel_direction == (
+            TravelStatus.DIRECTION_DOWN
+            if end_stop == self.tc.position_closed
+            else TravelStatus.DIRECTION_UP
+        )
+
+    async def _async_end_stop_reached(self, end_stop):
+        """Stop the motor early and resynchronize at end_stop."""
+        _LOGGER.debug("_async_end_stop_reached :: %d", end_stop)
+        self._async_learn_run(end_stop)
+        if self.is_calibrating:
+            if end_stop == self._calibrating_to:
+                self._end_stop_reached.set()
+            return
+        self.tc.confirm_end_stop(end_stop)
+        if self._unsubscribe_auto_stop is not None:
+            # The relay is still on, no need to run out the computed time
+            self.cancel_auto_stop()
+            self.stop_auto_updater()
+            await self._async_handle_command(SERVICE_STOP_COVER)
+        self.async_write_ha_state()
+
+    @callback
+    def _check_drift_budget(self):
+        """Recalibrate once the position may be off by more than the budget."""
+        if self._recalibration_return:
+            # The trip back drifts as well, with a small budget checking it
+            # would start the next recalibration
+            self._recalibration_return = False
+            return
+        if (
+            not self._drift_budget
+            or self.is_calibrating
+            or self._recalibration is not None
+            or self.tc.uncertainty() <= self._drift_budget
+        ):
+            return
+        _LOGGER.debug(
+            "_check_drift_budget :: uncertainty %.1f%% exceeds the budget",
+            self.tc.uncertainty(),
+        )
+        self._recalibration = self._async_create_task(self._async_recalibrate())
+
+    async def _async_recalibrate(self):
+        """Calibrate, then return to the position the cover was at."""
+        position = self.tc.current_position()
+        try:
+            await self.async_calibrate()
+            if position is not None and self.available:
+                await self.set_position(position)
+                self._recalibration_return = self.tc.is_traveling()
+        finally:
+            self._recalibration = None
+
+    def _end_stop_overrun(self, end_stop):
+        """Return how long to keep driving into end_stop past its arrival."""
+        if end_stop == self.tc.position_closed:
+            return self.tc.travel_time_down * self._calibration_overrun
+        return self.tc.travel_time_up * self._calibration_overrun
 
     async def _handle_state_changed(self, event):
         """Process changes in Home Assistant, look if switch is opened
         manually."""
+        self._measure_power_cutoff(event)
         if self.is_calibrating:
             # ignore all evnts while we're calibrating
             return
 
-        # If switch/light is not the target, skip
-        if event.data.get(ATTR_ENTITY_ID) not in [
-            self._close_switch_entity_id,
-            self._open_switch_entity_id,
-            self._stop_switch_entity_id,
-        ]:
-            return
-
         if event.data.get("new_state") is None:
             return
 
@@ -219,6 +830,18 @@ class CoverTimeBased(CoverEntity, RestoreEntity):
         if event.data.get("new_state").state == event.data.get("old_state").state:
             return
 
+        self._pipeline.async_observe(
+            event.data.get(ATTR_ENTITY_ID),
+            event.data.get("old_state"),
+            event.data.get("new_state"),
+        )
+        if self._auto_latency:
+            if self._pipeline.start_delay is not None:
+                self.tc.start_delay = self._pipeline.start_delay
+            if self._pipeline.stop_run_on is not None:
+                self.tc.stop_run_on = self._pipeline.stop_run_on
+            self.tc.changed()
+
         # avoid loop
         if event.data.get(ATTR_ENTITY_ID).startswith("script."):
             return
@@ -251,7 +874,8 @@ class CoverTimeBased(CoverEntity, RestoreEntity):
             ]
         )
 
-        if self._ignore_switch_updates_until is not None and time.time() < self._ignore_switch_updates_until:
+        if self._pipeline.is_echo(event.data.get("new_state")):
+            # Our own command reporting back, the travel is already tracked
             return
 
         # Handle new status
@@ -278,12 +902,13 @@ class CoverTimeBased(CoverEntity, RestoreEntity):
             await self.async_close_cover(handle_command=False)
 
     @not_calibrating
-    def _handle_my_button(self):
+    def _handle_my_button(self, now=None):
         """Handle the MY button press."""
         if self.tc.is_traveling():
             _LOGGER.debug("_handle_my_button :: button stops cover")
-            self.tc.stop()
+            self.tc.stop(now)
             self.stop_auto_updater()
+            self.cancel_auto_stop()
 
     @property
     def name(self):
@@ -291,40 +916,86 @@ class CoverTimeBased(CoverEntity, RestoreEntity):
         return self._name
 
     @property
-    def device_state_attributes(self):
+    def extra_state_attributes(self):
         """Return the device state attributes."""
         attr = {}
         if self._travel_time_down is not None:
             attr[CONF_TIME_CLOSE] = self._travel_time_down
         if self._travel_time_up is not None:
             attr[CONF_TIME_OPEN] = self._travel_time_up
+        if self._last_stop_jitter is not None:
+            attr[ATTR_STOP_JITTER] = round(self._last_stop_jitter, 3)
+        if self._last_command_latency is not None:
+            attr[ATTR_COMMAND_LATENCY] = round(self._last_command_latency, 3)
+        if self._pipeline is not None and self._pipeline.start_delay is not None:
+            attr[ATTR_MEASURED_START_DELAY] = round(self._pipeline.start_delay, 3)
+        if self._pipeline is not None and self._pipeline.stop_run_on is not None:
+            attr[ATTR_MEASURED_STOP_RUN_ON] = round(self._pipeline.stop_run_on, 3)
+        if self._last_power_detection_latency is not None:
+            attr[ATTR_POWER_DETECTION_LATENCY] = round(
+                self._last_power_detection_latency, 3
+            )
+        attr[ATTR_POSITION_UNCERTAINTY] = round(self.tc.uncertainty(), 1)
+        if self._learner is not None:
+            learned_time_open = self._learner.estimate(
+                self._attr_unique_id, "travel_time_up"
+            )
+            learned_time_close = self._learner.estimate(
+                self._attr_unique_id, "travel_time_down"
+            )
+            if learned_time_open is not None:
+                attr[ATTR_LEARNED_TIME_OPEN] = learned_time_open
+            if learned_time_close is not None:
+                attr[ATTR_LEARNED_TIME_CLOSE] = learned_time_close
+        attr[ATTR_COALESCED_COMMANDS] = self._coalesced_commands
+        attr[ATTR_DROPPED_COMMANDS] = self._dropped_commands
+        if self._power_group is not None:
+            attr[ATTR_POWER_QUEUE_DEPTH] = self._power_group.queue_depth
+            if self._last_power_wait is not None:
+                attr[ATTR_POWER_WAIT] = round(self._last_power_wait, 3)
+        if self._travel_snapshot().traveling:
+            # Everything a client needs to interpolate the position itself,
+            # the calculator runs on the monotonic loop clock.
+            started_at = dt_util.utc_from_timestamp(
+                self.tc._last_known_position_timestamp + self._wall_clock_offset
+            )
+            eta = dt_util.utc_from_timestamp(
+                self.tc.arrival_time() + self._wall_clock_offset
+            )
+            attr[ATTR_TRAVEL_START_POSITION] = self.tc._last_known_position
+            attr[ATTR_TRAVEL_TARGET_POSITION] = self.tc._travel_to_position
+            attr[ATTR_TRAVEL_STARTED_AT] = started_at.isoformat()
+            attr[ATTR_TRAVEL_ETA] = eta.isoformat()
         return attr
 
+    def _travel_snapshot(self):
+        """Return the travel state, evaluated once per state write."""
+        if self._snapshot is not None:
+            return self._snapshot
+        return self.tc.snapshot()
+
     @property
     def current_cover_position(self):
         """Return the current position of the cover."""
-        return self.tc.current_position()
+        return self._travel_snapshot().position
 
     @property
     def is_opening(self):
         """Return if the cover is opening or not."""
-        return (
-            self.tc.is_traveling()
-            and self.tc.travel_direction == TravelStatus.DIRECTION_DOWN
-        )
+        snapshot = self._travel_snapshot()
+        return snapshot.traveling and snapshot.direction == TravelStatus.DIRECTION_DOWN
 
     @property
     def is_closing(self):
         """Return if the cover is closing or not."""
-        return (
-            self.tc.is_traveling()
-            and self.tc.travel_direction == TravelStatus.DIRECTION_UP
-        )
+        snapshot = self._travel_snapshot()
+        return snapshot.traveling and snapshot.direction == TravelStatus.DIRECTION_UP
 
     @property
     def is_closed(self):
         """Return if the cover is closed."""
-        return self.current_cover_position is None or self.current_cover_position <= 10
+        position = self._travel_snapshot().position
+        return position is None or position <= 10
 
     @property
     def assumed_state(self):
@@ -354,8 +1025,44 @@ class CoverTimeBased(CoverEntity, RestoreEntity):
                 return
             position = kwargs[ATTR_POSITION]
             _LOGGER.debug("async_set_cover_position: %d", position)
+            if self._coalesce_window:
+                await self._async_coalesce_position(position)
+            else:
+                await self.set_position(position)
+
+    async def _async_coalesce_position(self, position):
+        """Collapse the positions requested within the window into the last."""
+        self._coalesced_position = position
+        if self._coalesced_move is None:
+            self._coalesced_move = self._async_create_task(self._async_coalesced_move())
+        else:
+            self._coalesced_commands += 1
+        # Every caller of the burst returns once the final move has started
+        await asyncio.shield(self._coalesced_move)
+
+    async def _async_coalesced_move(self):
+        """Move to the last position requested within the window."""
+        try:
+            await asyncio.sleep(self._coalesce_window)
+        finally:
+            self._coalesced_move = None
+        if (position := self._coalesced_position) is not None:
+            self._coalesced_position = None
+            # Checked when the position was requested, but the window is long
+            # enough for a calibration to start or the relays to go away.
+            await self.check_availability()
+            if self.is_calibrating or not self.available:
+                _LOGGER.debug("_async_coalesced_move :: dropping %d", position)
+                self._dropped_commands += 1
+                return
             await self.set_position(position)
 
+    def _cancel_coalesced_move(self):
+        """Drop the position waiting in the coalescing window."""
+        if self._coalesced_position is not None:
+            self._coalesced_position = None
+            self._dropped_commands += 1
+
     @not_calibrating
     async def async_close_cover(self, **kwargs):
         """Turn the device close."""
@@ -363,10 +1070,21 @@ class CoverTimeBased(CoverEntity, RestoreEntity):
         await self.check_availability()
         if not self.available:
             return
+        self._cancel_coalesced_move()
+        started_at = None
         if kwargs.get("handle_command") is not False:
-            await self._async_handle_command(SERVICE_CLOSE_COVER)
-        self.tc.start_travel_up()
+            if not await self._async_handle_command(SERVICE_CLOSE_COVER):
+                return
+            # The start delay is measured from the command
+            started_at = self._pipeline.started_at
+        else:
+            # Moved at the wall, the motor runs whether there is a slot or not
+            self._async_motor_started()
+            if self._power_group is not None:
+                self._power_group.async_claim(self)
+        self.tc.start_travel_up(started_at)
         self.start_auto_updater()
+        self.schedule_auto_stop()
 
     @not_calibrating
     async def async_open_cover(self, **kwargs):
@@ -375,10 +1093,21 @@ class CoverTimeBased(CoverEntity, RestoreEntity):
         await self.check_availability()
         if not self.available:
             return
+        self._cancel_coalesced_move()
+        started_at = None
         if kwargs.get("handle_command") is not False:
-            await self._async_handle_command(SERVICE_OPEN_COVER)
-        self.tc.start_travel_down()
+            if not await self._async_handle_command(SERVICE_OPEN_COVER):
+                return
+            # The start delay is measured from the command
+            started_at = self._pipeline.started_at
+        else:
+            # Moved at the wall, the motor runs whether there is a slot or not
+            self._async_motor_started()
+            if self._power_group is not None:
+                self._power_group.async_claim(self)
+        self.tc.start_travel_down(started_at)
         self.start_auto_updater()
+        self.schedule_auto_stop()
 
     @not_calibrating
     async def async_stop_cover(self, **kwargs):
@@ -387,10 +1116,20 @@ class CoverTimeBased(CoverEntity, RestoreEntity):
         await self.check_availability()
         if not self.available:
             return
+        self._cancel_coalesced_move()
         await self._async_handle_command(SERVICE_STOP_COVER)
-        self._handle_my_button()
+        # The run-on is measured from the command
+        self._handle_my_button(self._pipeline.stopped_at)
+        self.async_write_ha_state()
+        self._check_drift_budget()
 
-    async def set_position(self, position):
+    async def async_move_to(self, position, limiter=None):
+        """Move to position now, a position still waiting in the coalescing
+        window would override it."""
+        self._cancel_coalesced_move()
+        await self.set_position(position, limiter)
+
+    async def set_position(self, position, limiter=None):
         _LOGGER.debug("set_position")
         """Move cover to a designated position."""
         current_position = self.tc.current_position()
@@ -404,38 +1143,154 @@ class CoverTimeBased(CoverEntity, RestoreEntity):
             command = SERVICE_CLOSE_COVER
         elif position > current_position:
             command = SERVICE_OPEN_COVER
-        if command is not None:
-            await self._async_handle_command(command)
+        if command is None:
+            self._dropped_commands += 1
+            return
+        if self.tc.is_traveling() and self.tc.travel_direction == (
+            TravelStatus.DIRECTION_UP
+            if command == SERVICE_CLOSE_COVER
+            else TravelStatus.DIRECTION_DOWN
+        ):
+            # The motor already runs the right way, the relays stay as they are
+            _LOGGER.debug("set_position :: already moving, retargeting")
+            self.tc.retarget(position)
             self.start_auto_updater()
-            self.tc.start_travel(position)
-            _LOGGER.debug("set_position :: command %s", command)
-            # ignore async updates for a second. this prevents a switch change
-            # event triggering a full close/open when we wanted to set a
-            # position.
-            self._ignore_switch_updates_until = time.time() + 1
-        return
+            self.schedule_auto_stop()
+            return
+        if not await self._async_handle_command(
+            command, position=position, limiter=limiter
+        ):
+            return
+        # The start delay is measured from the command
+        self.tc.start_travel(position, self._pipeline.started_at)
+        self.start_auto_updater()
+        self.schedule_auto_stop()
+        _LOGGER.debug("set_position :: command %s", command)
 
     def start_auto_updater(self):
         """Start the autoupdater to update HASS while cover is moving."""
         _LOGGER.debug("start_auto_updater")
-        if self._unsubscribe_auto_updater is None:
+        # In ETA mode clients interpolate from the travel attributes, only the
+        # start and the end of the travel get written.
+        if (
+            self._update_mode != UPDATE_MODE_ETA
+            and self._unsubscribe_auto_updater is None
+        ):
             _LOGGER.debug("init _unsubscribe_auto_updater")
-            interval = timedelta(seconds=0.1)
-            self._unsubscribe_auto_updater = async_track_time_interval(
-                self.hass, self.auto_updater_hook, interval
-            )
+            self._unsubscribe_auto_updater = async_get_motion_scheduler(
+                self.hass
+            ).async_track(self.auto_updater_hook)
+        # Always write the position the travel starts from
+        self._wall_clock_offset = dt_util.utcnow().timestamp() - self.tc.clock()
+        self._intents.async_set(
+            self._attr_unique_id,
+            TravelIntent(
+                position=self.tc._last_known_position,
+                target=self.tc._travel_to_position,
+                started=self.tc._last_known_position_timestamp
+                + self._wall_clock_offset,
+            ),
+        )
+        self.async_write_ha_state()
+
+    @callback
+    def async_update_tuning(
+        self,
+        travel_time_down,
+        travel_time_up,
+        *,
+        update_interval,
+        update_threshold,
+        update_mode,
+        start_delay,
+        stop_run_on,
+        auto_latency,
+        travel_curve_down,
+        travel_curve_up,
+        coalesce_window,
+        calibration_overrun,
+        calibrate_on_full_travel,
+        drift_budget,
+        power_threshold,
+        power_min_runtime,
+        apply_learned_times,
+    ):
+        """Apply new travel times and tuning, rescaling the travel in progress."""
+        _LOGGER.debug("async_update_tuning :: %s", self._name)
+        # Fold what has been travelled so far with the old settings
+        self.tc.rebase()
+        if not travel_time_down:
+            travel_time_down = travel_time_up
+        self._travel_time_down = self.tc.travel_time_down = travel_time_down
+        self._travel_time_up = self.tc.travel_time_up = travel_time_up
+        self.tc.start_delay = start_delay
+        self.tc.stop_run_on = stop_run_on
+        self.tc.travel_curve_down = travel_curve_down
+        self.tc.travel_curve_up = travel_curve_up
+        self.tc.changed()
+        self._update_interval = update_interval
+        self._update_threshold = update_threshold
+        self._update_mode = update_mode
+        self._auto_latency = auto_latency
+        self._coalesce_window = coalesce_window
+        self._calibration_overrun = calibration_overrun / 100
+        self._calibrate_on_full_travel = calibrate_on_full_travel
+        self._drift_budget = drift_budget
+        self._power_threshold = power_threshold
+        self._power_min_runtime = power_min_runtime
+        self._apply_learned_times = apply_learned_times
+        if self._apply_learned_times:
+            self._async_apply_learned_times()
+
+        if not self.tc.is_traveling():
+            self.async_write_ha_state()
+            return
+        # Restart the updater in the new mode and move the arrival
+        self.stop_auto_updater()
+        self.start_auto_updater()
+        if self._unsubscribe_auto_stop is not None:
+            self.schedule_auto_stop()
 
     @callback
     def auto_updater_hook(self, now):
-        """Call for the autoupdater."""
-        current_position = self.tc.current_position()
-        travel_to = self.tc._travel_to_position
-        _LOGGER.debug("auto_updater_hook :: current_position: %d, travel_to: %d", current_position, travel_to)
-        self.async_schedule_update_ha_state()
-        if self.position_reached():
+        """Call for the autoupdater, only used to update the UI."""
+        # The motion ticker has just evaluated the whole fleet
+        clock = self._fleet.evaluated_at
+        snapshot = self._fleet.snapshot(self._fleet_slot)
+        if snapshot.reached:
             _LOGGER.debug("auto_updater_hook :: position_reached")
             self.stop_auto_updater()
-        self.hass.async_create_task(self.auto_stop_if_necessary())
+            self._async_write_snapshot(snapshot, clock)
+            return
+
+        # Rate-limit the intermediate positions, the recorder and every
+        # websocket client have to absorb each one of them.
+        if clock - self._last_written_at < self._update_interval:
+            return
+        if (
+            self._last_written_position is not None
+            and abs(snapshot.position - self._last_written_position)
+            < self._update_threshold
+        ):
+            return
+        self._async_write_snapshot(snapshot, clock)
+
+    @callback
+    def async_write_ha_state(self):
+        """Write the state from a single evaluation of the travel calculator."""
+        clock = self.tc.clock()
+        self._async_write_snapshot(self.tc.snapshot(clock), clock)
+
+    @callback
+    def _async_write_snapshot(self, snapshot, clock):
+        """Write the state from a travel snapshot taken at clock."""
+        self._snapshot = snapshot
+        self._last_written_position = snapshot.position
+        self._last_written_at = clock
+        try:
+            super().async_write_ha_state()
+        finally:
+            self._snapshot = None
 
     def stop_auto_updater(self):
         """Stop the autoupdater."""
@@ -444,6 +1299,77 @@ class CoverTimeBased(CoverEntity, RestoreEntity):
             self._unsubscribe_auto_updater()
             self._unsubscribe_auto_updater = None
 
+    def schedule_auto_stop(self):
+        """Schedule the stop command at the computed arrival time."""
+        self.cancel_auto_stop()
+        travel_time = self.tc.calculate_travel_time(
+            from_position=self.tc._last_known_position,
+            to_position=self.tc._travel_to_position,
+        )
+        # Cut early by the time the motor keeps running after the stop
+        travel_time = max(0.0, travel_time - self.tc.stop_run_on)
+        if self._overruns_end_stop():
+            # Keep driving into the end stop, whatever the error of the
+            # estimate the cover is at the end stop afterwards.
+            travel_time += self._end_stop_overrun(self.tc._travel_to_position)
+        _LOGGER.debug("schedule_auto_stop :: arrival in %.3fs", travel_time)
+        # The calculator runs on the loop clock, so its travel start is a
+        # valid loop deadline.
+        self._auto_stop_deadline = self.tc._last_known_position_timestamp + travel_time
+        self._unsubscribe_auto_stop = self.hass.loop.call_at(
+            self._auto_stop_deadline, self.auto_stop_hook
+        ).cancel
+
+    def _overruns_end_stop(self):
+        """Return if the current travel keeps driving into its end stop."""
+        return self._calibrate_on_full_travel and self.tc._travel_to_position in (
+            self.tc.position_open,
+            self.tc.position_closed,
+        )
+
+    def cancel_auto_stop(self):
+        """Cancel a scheduled stop command."""
+        if self._unsubscribe_auto_stop is not None:
+            self._unsubscribe_auto_stop()
+            self._unsubscribe_auto_stop = None
+
+    @callback
+    def auto_stop_hook(self):
+        """Cut the relay at the computed arrival time."""
+        self._unsubscribe_auto_stop = None
+        self._last_stop_jitter = self.hass.loop.time() - self._auto_stop_deadline
+        _LOGGER.debug(
+            "auto_stop_hook :: stop jitter: %.1fms", self._last_stop_jitter * 1000
+        )
+        # The arrival time is reached by definition, don't let the rounding in
+        # the position calculation leave the cover one step short.
+        if self._overruns_end_stop():
+            self.tc.confirm_end_stop(self.tc._travel_to_position)
+        else:
+            self.tc.set_position(self.tc._travel_to_position)
+        self.stop_auto_updater()
+        self._async_create_task(self.auto_stop_if_necessary())
+
+    @callback
+    def _async_create_task(self, target):
+        """Start a task owned by the entity, cancelled when it is removed."""
+        task = self.hass.async_create_task(target)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    @callback
+    def _async_cancel_pending(self):
+        """Cancel the timers and tasks of the entity when it is removed."""
+        _LOGGER.debug(
+            "_async_cancel_pending :: %s, %d tasks", self._name, len(self._tasks)
+        )
+        self.stop_auto_updater()
+        self.cancel_auto_stop()
+        self._cancel_coalesced_move()
+        for task in self._tasks:
+            task.cancel()
+
     def position_reached(self):
         """Return if cover has reached its final position."""
         return self.tc.position_reached()
@@ -456,48 +1382,51 @@ class CoverTimeBased(CoverEntity, RestoreEntity):
         if self.position_reached():
             _LOGGER.debug("auto_stop_if_necessary :: calling stop command")
             await self._async_handle_command(SERVICE_STOP_COVER)
-            self.tc.stop()
-
-    async def set_entity(self, state: str, entity_id, wait=False):
-        if state not in [STATE_ON, STATE_OFF]:
-            raise Exception(f"calling set_entity with wrong state {state}")
-
-        domain = "homeassistant"
-        action = f"turn_{state}"
-
-        if entity_id.startswith(Platform.BUTTON):
-            domain = "input_button"
-            action = "press"
-        elif entity_id.startswith("script"):
-            domain = "script"
-
-        return await self.hass.services.async_call(
-            domain, action, {"entity_id": entity_id}, wait
-        )
-
-    async def _async_handle_command(self, command, *args):
-        if command == SERVICE_CLOSE_COVER:
-            self._state = False
-            if self.has_stop_entity:
-                await self.set_entity(STATE_OFF, self._stop_switch_entity_id)
-            await self.set_entity(STATE_OFF, self._open_switch_entity_id)
-            await self.set_entity(STATE_ON, self._close_switch_entity_id, True)
-
-        elif command == SERVICE_OPEN_COVER:
-            self._state = True
-            if self.has_stop_entity:
-                await self.set_entity(STATE_OFF, self._stop_switch_entity_id)
-            await self.set_entity(STATE_OFF, self._close_switch_entity_id)
-            await self.set_entity(STATE_ON, self._open_switch_entity_id, True)
-
-        elif command == SERVICE_STOP_COVER:
-            self._state = True
-            await self.set_entity(STATE_OFF, self._close_switch_entity_id)
-            await self.set_entity(STATE_OFF, self._open_switch_entity_id)
-            if self.has_stop_entity:
-                await self.set_entity(STATE_ON, self._stop_switch_entity_id, True)
+            self.async_write_ha_state()
+            self._check_drift_budget()
+
+    async def _async_handle_command(self, command, *args, position=None, limiter=None):
+        """Send command, return False if a queued move was superseded.
+
+        The limiter, e.g. the semaphore of a service call, is only held
+        while the relays are switched, not while waiting for a power slot.
+        """
+        moving = command != SERVICE_STOP_COVER
+        if moving and self._power_group is not None:
+            if position is None:
+                position = (
+                    self.tc.position_closed
+                    if command == SERVICE_OPEN_COVER
+                    else self.tc.position_open
+                )
+            if (current_position := self.tc.current_position()) is None:
+                travel_time = max(self._travel_time_down, self._travel_time_up)
+            else:
+                travel_time = self.tc.calculate_travel_time(
+                    from_position=current_position, to_position=position
+                )
+            queued_at = self.hass.loop.time()
+            if not await self._power_group.async_acquire(self, travel_time):
+                _LOGGER.debug("_async_handle_command :: %s superseded", command)
+                return False
+            self._last_power_wait = self.hass.loop.time() - queued_at
+
+        self._state = command != SERVICE_CLOSE_COVER
+        try:
+            async with limiter or nullcontext():
+                self._last_command_latency = await self._pipeline.async_send(command)
+        except Exception:
+            if self._power_group is not None:
+                self._power_group.async_release(self)
+            raise
+        if self._power_group is not None and not moving:
+            self._power_group.async_release(self)
+        if moving:
+            self._async_motor_started(self._pipeline.started_at)
+        else:
+            self._motor_started_at = None
+            self._run_started_at = None
+            self._intents.async_clear(self._attr_unique_id)
 
         _LOGGER.debug("_async_handle_command :: %s", command)
-
-        # Update state of entity
-        self.async_write_ha_state()
+        return True
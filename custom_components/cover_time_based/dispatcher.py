@@ -0,0 +1,153 @@
+"""Shared state-change dispatcher for the Cover Time-based integration."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE
+from homeassistant.core import callback
+from homeassistant.core import Event
+from homeassistant.core import HassJob
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_track_entity_registry_updated_event
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import DATA_DISPATCHER
+from .const import DATA_REGISTRY_DISPATCHER
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StateChangeDispatcher:
+    """Route state changes of wired entities to the covers that own them.
+
+    Every wired entity gets exactly one ``async_track_state_change_event``
+    subscription, no matter how many covers use it, and the handlers are
+    looked up by entity_id. A state change therefore only wakes the covers
+    that are wired to the entity that changed.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self._jobs: dict[str, list[HassJob[[Event], Any]]] = {}
+        self._unsubscribe: dict[str, CALLBACK_TYPE] = {}
+        self.events_dispatched = 0
+
+    @property
+    def tracked_entities(self) -> int:
+        """Return the number of entities with a live subscription."""
+        return len(self._unsubscribe)
+
+    @property
+    def registrations(self) -> int:
+        """Return the number of registered handlers over all entities."""
+        return sum(len(jobs) for jobs in self._jobs.values())
+
+    @callback
+    def async_register(
+        self, entity_ids: Iterable[str | None], action: Callable[[Event], Any]
+    ) -> CALLBACK_TYPE:
+        """Call action for state changes of entity_ids, return an unsubscribe."""
+        job = HassJob(action, f"cover_time_based dispatch {action}")
+        entity_ids = {entity_id.lower() for entity_id in entity_ids if entity_id}
+
+        for entity_id in entity_ids:
+            self._jobs.setdefault(entity_id, []).append(job)
+            if entity_id not in self._unsubscribe:
+                self._unsubscribe[entity_id] = async_track_state_change_event(
+                    self.hass, entity_id, self._async_dispatch
+                )
+
+        @callback
+        def remove() -> None:
+            for entity_id in entity_ids:
+                jobs = self._jobs[entity_id]
+                jobs.remove(job)
+                if not jobs:
+                    del self._jobs[entity_id]
+                    self._unsubscribe.pop(entity_id)()
+
+        return remove
+
+    @callback
+    def _async_dispatch(self, event: Event) -> None:
+        """Run the handlers registered for the entity that changed."""
+        if not (jobs := self._jobs.get(event.data["entity_id"])):
+            return
+        self.events_dispatched += 1
+        for job in jobs.copy():
+            self.hass.async_run_hass_job(job, event)
+
+
+class RegistryUpdateDispatcher:
+    """Route entity registry updates of wired entities to their entries.
+
+    Every tracked entity gets exactly one
+    ``async_track_entity_registry_updated_event`` subscription, no matter how
+    many entries use it, and the handlers are looked up by entity_id. The
+    helper also matches a renamed entity by its old entity_id.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self._jobs: dict[str, list[HassJob[[Event], Any]]] = {}
+        self._unsubscribe: dict[str, CALLBACK_TYPE] = {}
+
+    @property
+    def tracked_entities(self) -> int:
+        """Return the number of entities with a live subscription."""
+        return len(self._unsubscribe)
+
+    @callback
+    def async_register(
+        self, entity_id: str, action: Callable[[Event], Any]
+    ) -> CALLBACK_TYPE:
+        """Call action for registry updates of entity_id, return an unsubscribe."""
+        job = HassJob(action, f"cover_time_based registry {action}")
+        entity_id = entity_id.lower()
+        self._jobs.setdefault(entity_id, []).append(job)
+        if entity_id not in self._unsubscribe:
+            self._unsubscribe[entity_id] = async_track_entity_registry_updated_event(
+                self.hass, entity_id, self._async_dispatch
+            )
+
+        @callback
+        def remove() -> None:
+            jobs = self._jobs[entity_id]
+            jobs.remove(job)
+            if not jobs:
+                del self._jobs[entity_id]
+                self._unsubscribe.pop(entity_id)()
+
+        return remove
+
+    @callback
+    def _async_dispatch(self, event: Event) -> None:
+        """Run the handlers registered for the entity updated."""
+        entity_id = event.data.get("old_entity_id", event.data["entity_id"])
+        for job in self._jobs.get(entity_id, []).copy():
+            self.hass.async_run_hass_job(job, event)
+
+
+@callback
+def async_get_dispatcher(hass: HomeAssistant) -> StateChangeDispatcher:
+    """Return the integration-wide state-change dispatcher."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if (dispatcher := data.get(DATA_DISPATCHER)) is None:
+        dispatcher = data[DATA_DISPATCHER] = StateChangeDispatcher(hass)
+    return dispatcher
+
+
+@callback
+def async_get_registry_dispatcher(hass: HomeAssistant) -> RegistryUpdateDispatcher:
+    """Return the integration-wide registry update dispatcher."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if (dispatcher := data.get(DATA_REGISTRY_DISPATCHER)) is None:
+        dispatcher = data[DATA_REGISTRY_DISPATCHER] = RegistryUpdateDispatcher(hass)
+    return dispatcher
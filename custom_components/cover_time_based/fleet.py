@@ -0,0 +1,234 @@
+"""Batched position evaluation for all covers of the integration."""
+
+from __future__ import annotations
+
+import logging
+import math
+from array import array
+
+from homeassistant.core import callback
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_FLEET
+from .const import DOMAIN
+from .travelcalculator import TravelCalculator
+from .travelcalculator import TravelSnapshot
+from .travelcalculator import TravelStatus
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+_LOGGER = logging.getLogger(__name__)
+
+_DIRECTION_DOWN = TravelStatus.DIRECTION_DOWN.value
+_DIRECTION_UP = TravelStatus.DIRECTION_UP.value
+_DIRECTION_STOPPED = TravelStatus.STOPPED.value
+
+
+class FleetPositionStore:
+    """Mirror the state of many TravelCalculators in array-backed columns.
+
+    Every registered calculator pushes its state into the columns whenever
+    it changes, and evaluate() computes the position of every traveling
+    cover in one pass: vectorized with NumPy when it is installed, in a
+    single loop over the columns otherwise. Stopped covers don't need any
+    computation, their position is kept as it was when they stopped.
+
+    Calculators with a travel curve are evaluated by the calculator itself.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the store."""
+        self._calculators: list[TravelCalculator | None] = []
+        self._free: list[int] = []
+        self._moving: set[int] = set()
+
+        self._last_position = array("d")
+        self._target_position = array("d")
+        self._timestamp = array("d")
+        self._start_delay = array("d")
+        self._travel_time_down = array("d")
+        self._travel_time_up = array("d")
+        self._direction = array("b")
+        self._curved = array("b")
+
+        self._positions: list[int | None] = []
+        self.evaluated_at: float | None = None
+
+    def __len__(self) -> int:
+        """Return the number of registered calculators."""
+        return len(self._calculators) - len(self._free)
+
+    @callback
+    def async_register(self, calculator: TravelCalculator) -> int:
+        """Start mirroring a calculator and return its slot."""
+        if self._free:
+            slot = self._free.pop()
+            self._calculators[slot] = calculator
+        else:
+            slot = len(self._calculators)
+            self._calculators.append(calculator)
+            for column in (
+                self._last_position,
+                self._target_position,
+                self._timestamp,
+                self._start_delay,
+                self._travel_time_down,
+                self._travel_time_up,
+            ):
+                column.append(math.nan)
+            self._direction.append(_DIRECTION_STOPPED)
+            self._curved.append(0)
+            self._positions.append(None)
+
+        calculator.on_change = lambda calculator: self._async_sync(slot, calculator)
+        self._async_sync(slot, calculator)
+        return slot
+
+    @callback
+    def async_unregister(self, slot: int) -> None:
+        """Stop mirroring the calculator in slot."""
+        if (calculator := self._calculators[slot]) is not None:
+            calculator.on_change = None
+        self._calculators[slot] = None
+        self._moving.discard(slot)
+        self._positions[slot] = None
+        self._free.append(slot)
+
+    @callback
+    def _async_sync(self, slot: int, calculator: TravelCalculator) -> None:
+        """Copy the state of calculator into its columns."""
+        last_position = calculator._last_known_position
+        target_position = calculator._travel_to_position
+        self._last_position[slot] = _column_value(last_position)
+        self._target_position[slot] = _column_value(target_position)
+        self._timestamp[slot] = calculator._last_known_position_timestamp
+        self._start_delay[slot] = calculator.start_delay
+        self._travel_time_down[slot] = calculator.travel_time_down
+        self._travel_time_up[slot] = calculator.travel_time_up
+        self._direction[slot] = calculator.travel_direction.value
+        self._curved[slot] = (
+            calculator.travel_curve_down is not None
+            or calculator.travel_curve_up is not None
+        )
+
+        if (
+            calculator._position_confirmed
+            or last_position is None
+            or target_position is None
+            or last_position == target_position
+        ):
+            self._moving.discard(slot)
+            self._positions[slot] = calculator.current_position()
+        else:
+            self._moving.add(slot)
+
+    @callback
+    def evaluate(self, now: float) -> list[int | None]:
+        """Compute the position of every cover at clock time now."""
+        self.evaluated_at = now
+        if not self._moving:
+            return self._positions
+
+        slots = [slot for slot in self._moving if not self._curved[slot]]
+        for slot in self._moving:
+            if self._curved[slot]:
+                self._positions[slot] = self._calculators[slot].current_position(now)
+
+        if np is not None:
+            self._evaluate_numpy(slots, now)
+        else:
+            self._evaluate_python(slots, now)
+        return self._positions
+
+    @callback
+    def snapshot(self, slot: int) -> TravelSnapshot:
+        """Return the travel state of slot from the last evaluation."""
+        calculator = self._calculators[slot]
+        position = self._positions[slot]
+        reached = position == calculator._travel_to_position
+        return TravelSnapshot(
+            position, calculator.travel_direction, not reached, reached
+        )
+
+    def _evaluate_numpy(self, slots: list[int], now: float) -> None:
+        """Vectorized evaluation of the linear travels in slots."""
+        if not slots:
+            return
+        index = np.fromiter(slots, dtype=np.intp, count=len(slots))
+        last = np.frombuffer(self._last_position)[index]
+        target = np.frombuffer(self._target_position)[index]
+        direction = np.frombuffer(self._direction, dtype=np.int8)[index]
+        relative = target - last
+
+        full = np.where(
+            relative > 0,
+            np.frombuffer(self._travel_time_down)[index],
+            np.frombuffer(self._travel_time_up)[index],
+        )
+        motion_time = full * np.abs(relative) / 100
+        elapsed = (
+            now
+            - np.frombuffer(self._timestamp)[index]
+            - np.frombuffer(self._start_delay)[index]
+        )
+        progress = np.divide(
+            elapsed, motion_time, out=np.ones_like(elapsed), where=motion_time > 0
+        )
+        positions = np.where(
+            elapsed <= 0,
+            last,
+            np.where(progress >= 1, target, np.trunc(last + relative * progress)),
+        )
+        reached = ((relative <= 0) & (direction == _DIRECTION_DOWN)) | (
+            (relative >= 0) & (direction == _DIRECTION_UP)
+        )
+        positions = np.where(reached, target, positions)
+
+        for slot, position in zip(slots, positions.tolist()):
+            self._positions[slot] = int(position)
+
+    def _evaluate_python(self, slots: list[int], now: float) -> None:
+        """Evaluate the linear travels in slots in one loop over the columns."""
+        last_column = self._last_position
+        target_column = self._target_position
+        for slot in slots:
+            last = last_column[slot]
+            target = target_column[slot]
+            relative = target - last
+            direction = self._direction[slot]
+            if (relative <= 0 and direction == _DIRECTION_DOWN) or (
+                relative >= 0 and direction == _DIRECTION_UP
+            ):
+                self._positions[slot] = int(target)
+                continue
+
+            full = (
+                self._travel_time_down[slot]
+                if relative > 0
+                else self._travel_time_up[slot]
+            )
+            motion_time = full * abs(relative) / 100
+            elapsed = now - self._timestamp[slot] - self._start_delay[slot]
+            if elapsed <= 0:
+                self._positions[slot] = int(last)
+            elif elapsed > motion_time:
+                self._positions[slot] = int(target)
+            else:
+                self._positions[slot] = int(last + relative * elapsed / motion_time)
+
+
+def _column_value(position: int | None) -> float:
+    """Return a position as stored in a float column."""
+    return math.nan if position is None else float(position)
+
+
+@callback
+def async_get_fleet(hass: HomeAssistant) -> FleetPositionStore:
+    """Return the integration-wide fleet position store."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if (fleet := data.get(DATA_FLEET)) is None:
+        fleet = data[DATA_FLEET] = FleetPositionStore()
+    return fleet
@@ -0,0 +1,85 @@
+"""Persisted travel intents for the Cover Time-based integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TypedDict
+
+from homeassistant.core import callback
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_INTENTS
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.travel"
+STORAGE_VERSION = 1
+# Short enough to survive a crash, long enough to batch a scene into one write
+SAVE_DELAY = 0.5
+
+
+class TravelIntent(TypedDict):
+    """A travel in progress."""
+
+    # Position the travel started from and its target
+    position: int
+    target: int
+    # Wall clock timestamp of the start command
+    started: float
+
+
+class TravelIntentStore:
+    """Remember the travels in progress across restarts.
+
+    An intent is written when a travel starts and removed when the relays
+    are stopped, never while the cover moves. After a crash or a restart in
+    the middle of a travel, it tells where the cover was going and since
+    when.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self._store: Store[dict[str, TravelIntent]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._intents: dict[str, TravelIntent] = {}
+        self._load_task: asyncio.Task[None] | None = None
+
+    async def async_load(self) -> None:
+        """Load the intents left by the previous run, once."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        """Read the store."""
+        self._intents = await self._store.async_load() or {}
+
+    def get(self, cover_id: str) -> TravelIntent | None:
+        """Return the travel of cover_id that was in progress, if any."""
+        return self._intents.get(cover_id)
+
+    @callback
+    def async_set(self, cover_id: str, intent: TravelIntent) -> None:
+        """Remember that cover_id started a travel."""
+        self._intents[cover_id] = intent
+        self._store.async_delay_save(lambda: self._intents, SAVE_DELAY)
+
+    @callback
+    def async_clear(self, cover_id: str) -> None:
+        """Forget the travel of cover_id once it is stopped."""
+        if self._intents.pop(cover_id, None) is not None:
+            self._store.async_delay_save(lambda: self._intents, SAVE_DELAY)
+
+
+async def async_get_intents(hass: HomeAssistant) -> TravelIntentStore:
+    """Return the integration-wide travel intent store, loaded."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if (intents := data.get(DATA_INTENTS)) is None:
+        intents = data[DATA_INTENTS] = TravelIntentStore(hass)
+    await intents.async_load()
+    return intents
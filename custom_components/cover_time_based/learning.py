@@ -0,0 +1,92 @@
+"""Travel time learning for the Cover Time-based integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from statistics import median
+
+from homeassistant.core import callback
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_LEARNING
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.learning"
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+# Number of runs kept per cover and direction
+SAMPLE_WINDOW = 9
+# Number of runs needed before an estimate is given
+MIN_SAMPLES = 3
+# Largest median absolute deviation, relative to the median, of a
+# converged estimate
+MAX_SPREAD = 0.05
+
+
+class TravelTimeLearner:
+    """Learn the travel times of the covers from measured end-to-end runs.
+
+    A run is measured when the cover leaves a confirmed end stop and an end
+    stop sensor or the power meter detects the arrival at the other one. The
+    last runs of every direction are kept, their median is the estimate once
+    they agree with each other.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the learner."""
+        self.hass = hass
+        self._store: Store[dict[str, dict[str, list[float]]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._samples: dict[str, dict[str, list[float]]] = {}
+        self._load_task: asyncio.Task[None] | None = None
+
+    async def async_load(self) -> None:
+        """Load the runs measured before the restart, once."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        """Read the store."""
+        self._samples = await self._store.async_load() or {}
+
+    @callback
+    def async_add_sample(self, cover_id: str, direction: str, duration: float) -> None:
+        """Record the duration of a run of cover_id in direction."""
+        _LOGGER.debug("async_add_sample :: %s %s %.2fs", cover_id, direction, duration)
+        samples = self._samples.setdefault(cover_id, {}).setdefault(direction, [])
+        samples.append(round(duration, 3))
+        del samples[:-SAMPLE_WINDOW]
+        self._store.async_delay_save(lambda: self._samples, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, cover_id: str) -> None:
+        """Forget the runs of cover_id."""
+        if self._samples.pop(cover_id, None) is not None:
+            self._store.async_delay_save(lambda: self._samples, SAVE_DELAY)
+
+    def estimate(self, cover_id: str, direction: str) -> float | None:
+        """Return the learned travel time, None until it has converged."""
+        samples = self._samples.get(cover_id, {}).get(direction, [])
+        if len(samples) < MIN_SAMPLES:
+            return None
+        travel_time = median(samples)
+        spread = median(abs(sample - travel_time) for sample in samples)
+        if spread > travel_time * MAX_SPREAD:
+            return None
+        return round(travel_time, 2)
+
+
+async def async_get_learner(hass: HomeAssistant) -> TravelTimeLearner:
+    """Return the integration-wide travel time learner, loaded."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if (learner := data.get(DATA_LEARNING)) is None:
+        learner = data[DATA_LEARNING] = TravelTimeLearner(hass)
+    await learner.async_load()
+    return learner
@@ -0,0 +1,82 @@
+"""Shared motion ticker for the Cover Time-based integration."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from datetime import datetime
+from datetime import timedelta
+
+from homeassistant.core import CALLBACK_TYPE
+from homeassistant.core import callback
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DATA_MOTION
+from .const import DOMAIN
+from .fleet import async_get_fleet
+
+_LOGGER = logging.getLogger(__name__)
+
+MOTION_INTERVAL = timedelta(seconds=0.1)
+
+
+class MotionScheduler:
+    """Drive the progress updates of every moving cover from one tick.
+
+    The tick only exists while at least one cover is traveling and only
+    walks the covers that are, so an idle house costs nothing. Each tick
+    first evaluates the positions of all traveling covers in one batch in
+    the FleetPositionStore, the hooks then read their position from it.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._hooks: dict[object, Callable[[datetime], None]] = {}
+        self._unsubscribe_tick: CALLBACK_TYPE | None = None
+
+    @property
+    def moving(self) -> int:
+        """Return the number of covers currently driven by the tick."""
+        return len(self._hooks)
+
+    @callback
+    def async_track(self, hook: Callable[[datetime], None]) -> CALLBACK_TYPE:
+        """Call hook on every tick until the returned callback is called."""
+        token = object()
+        self._hooks[token] = hook
+        if self._unsubscribe_tick is None:
+            _LOGGER.debug("MotionScheduler :: starting tick")
+            self._unsubscribe_tick = async_track_time_interval(
+                self.hass,
+                self._async_tick,
+                MOTION_INTERVAL,
+                name="cover_time_based motion",
+            )
+
+        @callback
+        def remove() -> None:
+            self._hooks.pop(token, None)
+            if not self._hooks and self._unsubscribe_tick is not None:
+                _LOGGER.debug("MotionScheduler :: nothing moving, stopping tick")
+                self._unsubscribe_tick()
+                self._unsubscribe_tick = None
+
+        return remove
+
+    @callback
+    def _async_tick(self, now: datetime) -> None:
+        """Advance every moving cover."""
+        async_get_fleet(self.hass).evaluate(self.hass.loop.time())
+        for hook in list(self._hooks.values()):
+            hook(now)
+
+
+@callback
+def async_get_motion_scheduler(hass: HomeAssistant) -> MotionScheduler:
+    """Return the integration-wide motion scheduler."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if (scheduler := data.get(DATA_MOTION)) is None:
+        scheduler = data[DATA_MOTION] = MotionScheduler(hass)
+    return scheduler
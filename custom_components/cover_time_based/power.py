@@ -0,0 +1,141 @@
+"""Power budget for covers sharing a circuit."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from collections.abc import Callable
+
+from homeassistant.core import CALLBACK_TYPE
+from homeassistant.core import callback
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_POWER
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PowerGroup:
+    """Limit the number of motors of a group running at the same time.
+
+    A move has to hold a slot while its motor runs. Moves that don't get one
+    wait in a queue and are started as soon as a slot frees up, the longest
+    travel first: starting the long travels early and filling the gaps with
+    the short ones keeps the time until the whole queue is done short.
+    """
+
+    def __init__(self, hass: HomeAssistant, name: str, max_running: int) -> None:
+        """Initialize the group."""
+        self.hass = hass
+        self.name = name
+        self.max_running = max_running
+        self._running: set[object] = set()
+        self._queue: list[tuple[float, int, object, asyncio.Future[bool]]] = []
+        self._waiting: dict[object, asyncio.Future[bool]] = {}
+        self._sequence = itertools.count()
+        self._members: dict[object, Callable[[], None]] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of moves waiting for a slot."""
+        return len(self._waiting)
+
+    @property
+    def members(self) -> int:
+        """Return the number of covers following the queue."""
+        return len(self._members)
+
+    @property
+    def running(self) -> int:
+        """Return the number of motors currently running."""
+        return len(self._running)
+
+    @callback
+    def async_add_member(
+        self, member: object, on_queue_change: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Call on_queue_change whenever moves are queued or dequeued."""
+        self._members[member] = on_queue_change
+
+        @callback
+        def remove() -> None:
+            self._members.pop(member, None)
+
+        return remove
+
+    @callback
+    def _async_queue_changed(self) -> None:
+        """Let every member of the group refresh its view of the queue."""
+        for on_queue_change in list(self._members.values()):
+            on_queue_change()
+
+    async def async_acquire(self, holder: object, travel_time: float) -> bool:
+        """Wait for a slot, return False if the move was superseded meanwhile."""
+        self.async_cancel(holder)
+        if holder in self._running or len(self._running) < self.max_running:
+            self.async_claim(holder)
+            return True
+
+        future = self.hass.loop.create_future()
+        self._waiting[holder] = future
+        heapq.heappush(
+            self._queue, (-travel_time, next(self._sequence), holder, future)
+        )
+        _LOGGER.debug(
+            "PowerGroup %s :: queued a %.1fs travel, %d waiting",
+            self.name,
+            travel_time,
+            self.queue_depth,
+        )
+        self._async_queue_changed()
+        try:
+            return await future
+        finally:
+            if self._waiting.get(holder) is future:
+                del self._waiting[holder]
+
+    @callback
+    def async_claim(self, holder: object) -> None:
+        """Take a slot without waiting, e.g. for a move made at the wall."""
+        self._running.add(holder)
+
+    @callback
+    def async_cancel(self, holder: object) -> None:
+        """Drop the queued move of holder, if any."""
+        if (future := self._waiting.pop(holder, None)) is not None:
+            if not future.done():
+                future.set_result(False)
+            self._async_queue_changed()
+
+    @callback
+    def async_release(self, holder: object) -> None:
+        """Free the slot of holder and start the next queued moves."""
+        self.async_cancel(holder)
+        self._running.discard(holder)
+        started = False
+        while self._queue and len(self._running) < self.max_running:
+            _, _, waiter, future = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            del self._waiting[waiter]
+            self.async_claim(waiter)
+            future.set_result(True)
+            started = True
+        if started:
+            self._async_queue_changed()
+
+
+@callback
+def async_get_power_group(
+    hass: HomeAssistant, name: str, max_running: int
+) -> PowerGroup:
+    """Return the power group called name, shared by all its covers."""
+    groups = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_POWER, {})
+    if (group := groups.get(name)) is None:
+        group = groups[name] = PowerGroup(hass, name, max_running)
+    else:
+        group.max_running = max_running
+    return group
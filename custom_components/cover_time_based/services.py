@@ -0,0 +1,309 @@
+"""Integration services for the Cover Time-based integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+from typing import TYPE_CHECKING
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.config_entries import SOURCE_IMPORT
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.const import CONF_NAME
+from homeassistant.const import ENTITY_MATCH_ALL
+from homeassistant.core import callback
+from homeassistant.core import HomeAssistant
+from homeassistant.core import ServiceCall
+from homeassistant.core import ServiceResponse
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+
+from .const import CONF_ENTITY_DOWN
+from .const import CONF_ENTITY_STOP
+from .const import CONF_ENTITY_UP
+from .const import CONF_START_DELAY
+from .const import CONF_STOP_RUN_ON
+from .const import CONF_TIME_CLOSE
+from .const import CONF_TIME_OPEN
+from .const import DATA_COVERS
+from .const import DEFAULT_START_DELAY
+from .const import DEFAULT_STOP_RUN_ON
+from .const import DOMAIN
+from .const import SERVICE_CALIBRATE
+from .const import SERVICE_PROVISION
+from .const import SERVICE_SET_POSITIONS
+
+if TYPE_CHECKING:
+    from .cover import CoverTimeBased
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_POSITIONS = "positions"
+ATTR_MAX_CONCURRENCY = "max_concurrency"
+ATTR_COVERS = "covers"
+ATTR_DURATION = "duration"
+ATTR_SKIPPED = "skipped"
+ATTR_ENTRY_ID = "entry_id"
+
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_CALIBRATE_CONCURRENCY = 4
+
+SET_POSITIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_POSITIONS): vol.All(
+            {cv.entity_id: vol.All(vol.Coerce(int), vol.Range(min=0, max=100))},
+            vol.Length(min=1),
+        ),
+        vol.Optional(ATTR_MAX_CONCURRENCY, default=DEFAULT_MAX_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+    }
+)
+
+
+CALIBRATE_SCHEMA = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Optional(
+            ATTR_MAX_CONCURRENCY, default=DEFAULT_CALIBRATE_CONCURRENCY
+        ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+PROVISION_COVER_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME): cv.string,
+        vol.Required(CONF_ENTITY_UP): cv.entity_id_or_uuid,
+        vol.Required(CONF_ENTITY_DOWN): cv.entity_id_or_uuid,
+        vol.Optional(CONF_ENTITY_STOP): cv.entity_id_or_uuid,
+        vol.Required(CONF_TIME_OPEN): vol.All(
+            vol.Coerce(float), vol.Range(min=2, max=120)
+        ),
+        vol.Optional(CONF_TIME_CLOSE): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=120)
+        ),
+        vol.Optional(CONF_START_DELAY, default=DEFAULT_START_DELAY): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=10)
+        ),
+        vol.Optional(CONF_STOP_RUN_ON, default=DEFAULT_STOP_RUN_ON): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=10)
+        ),
+    }
+)
+
+PROVISION_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_COVERS): vol.All(
+            cv.ensure_list, [PROVISION_COVER_SCHEMA], vol.Length(min=1)
+        ),
+        vol.Optional(ATTR_MAX_CONCURRENCY, default=DEFAULT_MAX_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+    }
+)
+
+
+@callback
+def async_validate_manifest(
+    hass: HomeAssistant, covers: list[dict[str, Any]]
+) -> list[str]:
+    """Check every cover of a manifest, return all the problems found."""
+    registry = er.async_get(hass)
+    errors: list[str] = []
+    names: set[str] = set()
+    for cover in covers:
+        name = cover[CONF_NAME]
+        if name.casefold() in names:
+            errors.append(f"{name}: duplicate name")
+        names.add(name.casefold())
+        for key in (CONF_ENTITY_UP, CONF_ENTITY_DOWN, CONF_ENTITY_STOP):
+            if not (entity_id := cover.get(key)):
+                continue
+            try:
+                entity_id = er.async_validate_entity_id(registry, entity_id)
+            except vol.Invalid:
+                errors.append(f"{name}: {key} {entity_id} is not registered")
+                continue
+            if (
+                registry.async_get(entity_id) is None
+                and hass.states.get(entity_id) is None
+            ):
+                errors.append(f"{name}: {key} {entity_id} does not exist")
+    return errors
+
+
+@callback
+def async_get_covers(hass: HomeAssistant) -> dict[str, CoverTimeBased]:
+    """Return the covers of the integration by entity id."""
+    return hass.data.setdefault(DOMAIN, {}).setdefault(DATA_COVERS, {})
+
+
+async def async_provision_covers(
+    hass: HomeAssistant, covers: list[dict[str, Any]], max_concurrency: int
+) -> dict[str, Any]:
+    """Create the covers of a manifest, all or none of them."""
+    # Check the whole manifest before anything is created
+    if errors := async_validate_manifest(hass, covers):
+        raise ServiceValidationError(
+            f"Invalid provisioning manifest: {'; '.join(errors)}"
+        )
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    created: dict[str, dict[str, Any]] = {}
+    skipped: list[str] = []
+
+    async def async_create(cover: dict[str, Any]) -> None:
+        async with semaphore:
+            start = hass.loop.time()
+            # Creating the entry also sets it up
+            result = await hass.config_entries.flow.async_init(
+                DOMAIN, context={"source": SOURCE_IMPORT}, data=cover
+            )
+            duration = round(hass.loop.time() - start, 3)
+        if result["type"] != "create_entry":
+            _LOGGER.debug(
+                "provision :: skipping %s: %s",
+                cover[CONF_NAME],
+                result.get("reason"),
+            )
+            skipped.append(cover[CONF_NAME])
+            return
+        created[cover[CONF_NAME]] = {
+            ATTR_ENTRY_ID: result["result"].entry_id,
+            ATTR_DURATION: duration,
+        }
+
+    start = hass.loop.time()
+    await asyncio.gather(*(async_create(cover) for cover in covers))
+    duration = round(hass.loop.time() - start, 3)
+    _LOGGER.info(
+        "Provisioned %d covers in %.1fs, %d already configured",
+        len(created),
+        duration,
+        len(skipped),
+    )
+    return {
+        ATTR_DURATION: duration,
+        ATTR_COVERS: created,
+        ATTR_SKIPPED: skipped,
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_set_positions(call: ServiceCall) -> None:
+        """Move many covers to their own position at once."""
+        covers = async_get_covers(hass)
+        targets: list[tuple[CoverTimeBased, int]] = []
+        for entity_id, position in call.data[ATTR_POSITIONS].items():
+            if (cover := covers.get(entity_id)) is None:
+                raise ServiceValidationError(f"{entity_id} is not a time based cover")
+            targets.append((cover, position))
+
+        moves = []
+        for cover, position in targets:
+            await cover.check_availability()
+            if not cover.available:
+                _LOGGER.debug("set_positions :: %s is unavailable", cover.entity_id)
+            elif cover.is_calibrating:
+                _LOGGER.warning(
+                    "set_positions :: skipping %s, it is calibrating", cover.entity_id
+                )
+            else:
+                moves.append((cover, position))
+
+        semaphore = asyncio.Semaphore(call.data[ATTR_MAX_CONCURRENCY])
+
+        start = hass.loop.time()
+        # Covers waiting in a power group don't hold a slot of the semaphore
+        await asyncio.gather(
+            *(cover.async_move_to(position, semaphore) for cover, position in moves)
+        )
+        _LOGGER.debug(
+            "set_positions :: started %d covers in %.1fms",
+            len(moves),
+            (hass.loop.time() - start) * 1000,
+        )
+
+    async def async_calibrate(call: ServiceCall) -> ServiceResponse:
+        """Calibrate many covers, a limited number at a time."""
+        covers = async_get_covers(hass)
+        if (
+            not any(key in call.data for key in cv.ENTITY_SERVICE_FIELDS)
+            or call.data.get(ATTR_ENTITY_ID) == ENTITY_MATCH_ALL
+        ):
+            targets = list(covers.values())
+        else:
+            selected = async_extract_referenced_entity_ids(hass, call)
+            for entity_id in selected.referenced:
+                if entity_id not in covers:
+                    raise ServiceValidationError(
+                        f"{entity_id} is not a time based cover"
+                    )
+            targets = [
+                covers[entity_id]
+                for entity_id in selected.referenced | selected.indirectly_referenced
+                if entity_id in covers
+            ]
+
+        semaphore = asyncio.Semaphore(call.data[ATTR_MAX_CONCURRENCY])
+        durations: dict[str, float] = {}
+        skipped: list[str] = []
+
+        async def async_calibrate_cover(cover: CoverTimeBased) -> None:
+            async with semaphore:
+                await cover.check_availability()
+                if not cover.available or cover.is_calibrating:
+                    skipped.append(cover.entity_id)
+                    return
+                start = hass.loop.time()
+                await cover.async_calibrate()
+                durations[cover.entity_id] = round(hass.loop.time() - start, 3)
+            _LOGGER.info(
+                "Calibrated %s in %.1fs (%d/%d)",
+                cover.entity_id,
+                durations[cover.entity_id],
+                len(durations) + len(skipped),
+                len(targets),
+            )
+
+        start = hass.loop.time()
+        await asyncio.gather(*(async_calibrate_cover(cover) for cover in targets))
+        return {
+            ATTR_DURATION: round(hass.loop.time() - start, 3),
+            ATTR_COVERS: {
+                entity_id: {ATTR_DURATION: duration}
+                for entity_id, duration in durations.items()
+            },
+            ATTR_SKIPPED: skipped,
+        }
+
+    async def async_provision(call: ServiceCall) -> ServiceResponse:
+        """Create the covers of a manifest, all or none of them."""
+        return await async_provision_covers(
+            hass, call.data[ATTR_COVERS], call.data[ATTR_MAX_CONCURRENCY]
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_POSITIONS, async_set_positions, SET_POSITIONS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROVISION,
+        async_provision,
+        PROVISION_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CALIBRATE,
+        async_calibrate,
+        CALIBRATE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -17,10 +17,20 @@ from __future__ import annotations
 
 import logging
 import time
+from collections.abc import Callable
 from enum import Enum
+from typing import NamedTuple
+
+from .travelcurve import TravelCurve
 
 _LOGGER = logging.getLogger(__name__)
 
+# Growth of the position uncertainty, in percent, per second of travel and
+# per reversal of the travel direction.
+DRIFT_PER_SECOND = 0.1
+DRIFT_PER_REVERSAL = 1.0
+
+
 class TravelStatus(Enum):
     """Enum class for travel status."""
 
@@ -29,6 +39,15 @@ class TravelStatus(Enum):
     STOPPED = 3
 
 
+class TravelSnapshot(NamedTuple):
+    """Position and travel state of a cover, evaluated at one instant."""
+
+    position: int | None
+    direction: TravelStatus
+    traveling: bool
+    reached: bool
+
+
 class TravelCalculator:
     """Class for calculating the current position of a cover."""
 
@@ -36,6 +55,16 @@ class TravelCalculator:
         "travel_direction",
         "travel_time_down",
         "travel_time_up",
+        "start_delay",
+        "stop_run_on",
+        "travel_curve_down",
+        "travel_curve_up",
+        "clock",
+        "on_change",
+        "drift_per_second",
+        "drift_per_reversal",
+        "_drift",
+        "_previous_direction",
         "_last_known_position",
         "_last_known_position_timestamp",
         "_position_confirmed",
@@ -44,11 +73,39 @@ class TravelCalculator:
         "position_open",
     )
 
-    def __init__(self, travel_time_down: float, travel_time_up: float) -> None:
-        """Initialize TravelCalculator class."""
+    def __init__(
+        self,
+        travel_time_down: float,
+        travel_time_up: float,
+        start_delay: float = 0.0,
+        stop_run_on: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        travel_curve_down: TravelCurve | None = None,
+        travel_curve_up: TravelCurve | None = None,
+    ) -> None:
+        """Initialize TravelCalculator class.
+
+        The clock must be monotonic, it defaults to the one the asyncio event
+        loop uses. Without travel curves the cover moves linearly.
+        """
         self.travel_direction = TravelStatus.STOPPED
         self.travel_time_down = travel_time_down
         self.travel_time_up = travel_time_up
+        # Seconds between the start command and the motor moving, and seconds
+        # the motor keeps running after the stop command.
+        self.start_delay = start_delay
+        self.stop_run_on = stop_run_on
+        self.clock = clock
+        self.travel_curve_down = travel_curve_down
+        self.travel_curve_up = travel_curve_up
+        # Called whenever the travel state changes, e.g. to mirror it in a
+        # FleetPositionStore.
+        self.on_change: Callable[[TravelCalculator], None] | None = None
+        # Uncertainty of the position accumulated since the last end stop
+        self.drift_per_second = DRIFT_PER_SECOND
+        self.drift_per_reversal = DRIFT_PER_REVERSAL
+        self._drift: float = 0.0
+        self._previous_direction: TravelStatus | None = None
 
         self._last_known_position: int | None = None
         self._last_known_position_timestamp: float = 0.0
@@ -65,33 +122,50 @@ class TravelCalculator:
         self._travel_to_position = position
         self.update_position(position)
 
-    def update_position(self, position: int) -> None:
+    def update_position(self, position: int, now: float | None = None) -> None:
         """Update known position of cover."""
         _LOGGER.debug("update_position :: position: %d", position)
+        if now is None:
+            now = self.clock()
+        self._account_drift(now)
+        if self._position_confirmed or self._travel_to_position in (None, position):
+            self._last_known_position_timestamp = now
+        else:
+            # Corrected in the middle of a travel, the motor already runs
+            self._last_known_position_timestamp = max(
+                now - self.start_delay, self._last_known_position_timestamp
+            )
         self._last_known_position = position
-        self._last_known_position_timestamp = time.time()
         if position == self._travel_to_position:
             self._position_confirmed = True
+        self.changed()
 
-    def stop(self) -> None:
+    def stop(self, now: float | None = None) -> None:
         """Stop traveling."""
-        stop_position = self.current_position()
+        if now is None:
+            now = self.clock()
+        # The motor keeps running for a moment after being cut
+        stop_position = self.current_position(now + self.stop_run_on)
         _LOGGER.debug("stop :: stop_position: %d", stop_position)
         if stop_position is None:
             return
+        self._account_drift(now + self.stop_run_on)
         self._last_known_position = stop_position
         self._travel_to_position = stop_position
         self._position_confirmed = False
         self.travel_direction = TravelStatus.STOPPED
+        self.changed()
 
-    def start_travel(self, _travel_to_position: int) -> None:
+    def start_travel(self, _travel_to_position: int, now: float | None = None) -> None:
         """Start traveling to position."""
         _LOGGER.debug("start_travel :: travel_to_position: %d", _travel_to_position)
         if self._last_known_position is None:
             self.set_position(_travel_to_position)
             return
-        self.stop()
-        self._last_known_position_timestamp = time.time()
+        if now is None:
+            now = self.clock()
+        self.stop(now)
+        self._last_known_position_timestamp = now
         self._travel_to_position = _travel_to_position
         self._position_confirmed = False
 
@@ -100,23 +174,110 @@ class TravelCalculator:
             if _travel_to_position > self._last_known_position
             else TravelStatus.DIRECTION_UP
         )
+        if self._previous_direction not in (None, self.travel_direction):
+            self._drift += self.drift_per_reversal
+        self._previous_direction = self.travel_direction
+        self.changed()
+
+    def retarget(self, _travel_to_position: int, now: float | None = None) -> None:
+        """Change the target of the current travel, the motor keeps running."""
+        _LOGGER.debug("retarget :: travel_to_position: %d", _travel_to_position)
+        if now is None:
+            now = self.clock()
+        position = self.current_position(now)
+        self._account_drift(now)
+        self._last_known_position = position
+        # Continue from where the travel is, only what is left of the start
+        # delay still has to pass.
+        self._last_known_position_timestamp = max(
+            now - self.start_delay, self._last_known_position_timestamp
+        )
+        self._travel_to_position = _travel_to_position
+        self._position_confirmed = False
+        self.changed()
+
+    def rebase(self, now: float | None = None) -> None:
+        """Restart the current travel from where the cover is now.
+
+        Used before changing the travel times or curves, the rest of the
+        travel then runs at the new speed.
+        """
+        if self.is_traveling():
+            self.retarget(self._travel_to_position, now)
+
+    def confirm_end_stop(self, position: int) -> None:
+        """Set the position of a cover known to be at an end stop."""
+        _LOGGER.debug("confirm_end_stop :: position: %d", position)
+        self.set_position(position)
+        self._drift = 0.0
+        self._previous_direction = None
+
+    def confirm_position(self, position: int, now: float | None = None) -> None:
+        """Set the position read from a sensor, also in the middle of a travel."""
+        _LOGGER.debug("confirm_position :: position: %d", position)
+        if self.is_traveling():
+            self.update_position(position, now)
+        else:
+            self.set_position(position)
+        self._drift = 0.0
+
+    def restore_uncertainty(self, uncertainty: float) -> None:
+        """Set the uncertainty accumulated before a restart."""
+        self._drift = min(100.0, max(0.0, uncertainty))
+
+    def uncertainty(self, now: float | None = None) -> float:
+        """Return how many percent the position may be off."""
+        if now is None:
+            now = self.clock()
+        return min(100.0, self._drift + self._travel_drift(now))
+
+    def _travel_drift(self, now: float) -> float:
+        """Return the uncertainty added by the current travel until now."""
+        if (
+            self._position_confirmed
+            or self._last_known_position is None
+            or self._travel_to_position is None
+        ):
+            return 0.0
+        moving = min(
+            now - self._last_known_position_timestamp - self.start_delay,
+            self._calculate_motion_time(
+                self._last_known_position, self._travel_to_position
+            ),
+        )
+        return max(0.0, moving) * self.drift_per_second
 
-    def start_travel_up(self) -> None:
+    def _account_drift(self, now: float) -> None:
+        """Add the uncertainty of the travel that is left at now."""
+        self._drift = min(100.0, self._drift + self._travel_drift(now))
+
+    def changed(self) -> None:
+        """Notify the listener that the travel state or parameters changed."""
+        if self.on_change is not None:
+            self.on_change(self)
+
+    def start_travel_up(self, now: float | None = None) -> None:
         """Start traveling up."""
         _LOGGER.debug("start_travel_up")
-        self.start_travel(self.position_open)
+        self.start_travel(self.position_open, now)
 
-    def start_travel_down(self) -> None:
+    def start_travel_down(self, now: float | None = None) -> None:
         """Start traveling down."""
         _LOGGER.debug("start_travel_down")
-        self.start_travel(self.position_closed)
+        self.start_travel(self.position_closed, now)
 
-    def current_position(self) -> int | None:
+    def current_position(self, now: float | None = None) -> int | None:
         """Return current (calculated or known) position."""
         if not self._position_confirmed:
-            return self._calculate_position()
+            return self._calculate_position(self.clock() if now is None else now)
         return self._last_known_position
 
+    def snapshot(self, now: float | None = None) -> TravelSnapshot:
+        """Return position, direction and travel state from one evaluation."""
+        position = self.current_position(now)
+        reached = position == self._travel_to_position
+        return TravelSnapshot(position, self.travel_direction, not reached, reached)
+
     def is_traveling(self) -> bool:
         """Return if cover is traveling."""
         return self.current_position() != self._travel_to_position
@@ -145,44 +306,89 @@ class TravelCalculator:
         """Return if cover is (fully) closed."""
         return self.current_position() == self.position_closed
 
-    def _calculate_position(self) -> int | None:
-        """Return calculated position."""
+    def _calculate_position(self, now: float) -> int | None:
+        """Return calculated position at the given clock time."""
         if self._travel_to_position is None or self._last_known_position is None:
             return self._last_known_position
         relative_position = self._travel_to_position - self._last_known_position
 
-        def position_reached_or_exceeded(relative_position: int) -> bool:
-            """Return if designated position was reached."""
-            if (
-                relative_position <= 0
-                and self.travel_direction == TravelStatus.DIRECTION_DOWN
-            ):
-                return True
-            if (
-                relative_position >= 0
-                and self.travel_direction == TravelStatus.DIRECTION_UP
-            ):
-                return True
-            return False
-
-        if position_reached_or_exceeded(relative_position):
+        # Designated position was reached or exceeded
+        if (
+            relative_position <= 0
+            and self.travel_direction == TravelStatus.DIRECTION_DOWN
+        ) or (
+            relative_position >= 0
+            and self.travel_direction == TravelStatus.DIRECTION_UP
+        ):
             return self._travel_to_position
 
-        remaining_travel_time = self.calculate_travel_time(
+        remaining_travel_time = self._calculate_motion_time(
             from_position=self._last_known_position,
             to_position=self._travel_to_position,
         )
-        if time.time() > self._last_known_position_timestamp + remaining_travel_time:
+        elapsed = now - self._last_known_position_timestamp - self.start_delay
+        if elapsed <= 0:
+            return self._last_known_position
+        if elapsed > remaining_travel_time:
             return self._travel_to_position
 
-        progress = (
-            time.time() - self._last_known_position_timestamp
-        ) / remaining_travel_time
+        if relative_position > 0 and self.travel_curve_down is not None:
+            start = self.travel_curve_down.time_at(self._last_known_position)
+            return int(
+                self.travel_curve_down.position_at(
+                    start + elapsed / self.travel_time_down
+                )
+            )
+        if relative_position < 0 and self.travel_curve_up is not None:
+            start = self.travel_curve_up.time_at(
+                self.position_closed - self._last_known_position
+            )
+            return self.position_closed - int(
+                self.travel_curve_up.position_at(start + elapsed / self.travel_time_up)
+            )
+
+        progress = elapsed / remaining_travel_time
         return int(self._last_known_position + relative_position * progress)
 
     def calculate_travel_time(self, from_position: int, to_position: int) -> float:
-        """Calculate time to travel from one position to another."""
+        """Calculate time from the start command until a position is
+        reached."""
+        return self.start_delay + self._calculate_motion_time(
+            from_position, to_position
+        )
+
+    def arrival_time(self, now: float | None = None) -> float | None:
+        """Return the clock time the current travel reaches its target."""
+        if now is None:
+            now = self.clock()
+        position = self.current_position(now)
+        if position is None or self._travel_to_position is None:
+            return None
+        # Only the part of the start delay that has not passed yet is ahead,
+        # a retargeted or corrected travel already had some or all of it.
+        pending_delay = max(
+            0.0, self._last_known_position_timestamp + self.start_delay - now
+        )
+        return (
+            now
+            + pending_delay
+            + self._calculate_motion_time(position, self._travel_to_position)
+        )
+
+    def _calculate_motion_time(self, from_position: int, to_position: int) -> float:
+        """Calculate time the motor runs to travel from one position to
+        another."""
         travel_range = to_position - from_position
+        if travel_range > 0 and self.travel_curve_down is not None:
+            return self.travel_time_down * (
+                self.travel_curve_down.time_at(to_position)
+                - self.travel_curve_down.time_at(from_position)
+            )
+        if travel_range < 0 and self.travel_curve_up is not None:
+            return self.travel_time_up * (
+                self.travel_curve_up.time_at(self.position_closed - to_position)
+                - self.travel_curve_up.time_at(self.position_closed - from_position)
+            )
         travel_time_full = (
             self.travel_time_down if travel_range > 0 else self.travel_time_up
         )
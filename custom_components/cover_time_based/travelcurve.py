@@ -0,0 +1,83 @@
+"""Non-linear travel profiles for the Cover Time-based integration.
+
+A travel curve describes how far a cover has traveled after a fraction of
+its full travel time, e.g. roller shutters that move faster once the rolled
+up diameter shrinks, or venetian blinds that spend the first second rotating
+their slats without moving at all:
+
+    [[0, 0], [0.1, 0], [0.6, 70], [1, 100]]
+
+Each point is a (time fraction, position in percent) pair, measured from the
+end stop the travel starts at. The curve is compiled once into two lookup
+tables so that both directions of the conversion are O(1).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+# Number of time steps in the position lookup table
+TIME_RESOLUTION = 1000
+
+
+class TravelCurve:
+    """Precomputed conversion between travel time and position."""
+
+    __slots__ = ("points", "_position_at", "_time_at")
+
+    def __init__(self, points: Sequence[Sequence[float]]) -> None:
+        """Compile the curve, raise ValueError if the points are invalid."""
+        points = [(float(time), float(position)) for time, position in points]
+        if len(points) < 2 or points[0] != (0, 0) or points[-1] != (1, 100):
+            raise ValueError("travel curve must run from [0, 0] to [1, 100]")
+        for (time_a, position_a), (time_b, position_b) in zip(points, points[1:]):
+            if time_b <= time_a or position_b < position_a:
+                raise ValueError("travel curve must be increasing")
+        self.points = points
+
+        # Position reached after each time step
+        self._position_at = [
+            _interpolate(points, step / TIME_RESOLUTION)
+            for step in range(TIME_RESOLUTION + 1)
+        ]
+
+        # Time at which each whole position is first reached, so that a
+        # travel away from an end stop includes any dead zone at its start.
+        self._time_at = []
+        segment = 0
+        for position in range(101):
+            while points[segment + 1][1] < position:
+                segment += 1
+            (time_a, position_a), (time_b, position_b) = points[segment : segment + 2]
+            if position_b == position_a:
+                self._time_at.append(time_a)
+            else:
+                self._time_at.append(
+                    time_a
+                    + (time_b - time_a)
+                    * (position - position_a)
+                    / (position_b - position_a)
+                )
+
+    def time_at(self, position: int) -> float:
+        """Return the time fraction at which position is reached."""
+        return self._time_at[position]
+
+    def position_at(self, time: float) -> float:
+        """Return the position reached after a time fraction."""
+        if time >= 1:
+            return 100.0
+        step, remainder = divmod(time * TIME_RESOLUTION, 1)
+        step = int(step)
+        position = self._position_at[step]
+        return position + (self._position_at[step + 1] - position) * remainder
+
+
+def _interpolate(points: list[tuple[float, float]], time: float) -> float:
+    """Return the position at time by linear interpolation of the points."""
+    for (time_a, position_a), (time_b, position_b) in zip(points, points[1:]):
+        if time <= time_b:
+            return position_a + (position_b - position_a) * (time - time_a) / (
+                time_b - time_a
+            )
+    return 100.0
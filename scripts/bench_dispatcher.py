@@ -0,0 +1,123 @@
+"""Benchmark the state-change dispatcher against unrelated state changes.
+
+Wires a fixed number of covers to the StateChangeDispatcher on a bare
+HomeAssistant instance, then changes the state of every wired relay mixed
+with a growing number of unrelated state changes. Only the wired changes may
+reach the dispatcher, and the time spent in it per wired change has to stay
+flat.
+
+Run from the repository root:
+
+    python scripts/bench_dispatcher.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.core import callback  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.cover_time_based.dispatcher import (  # noqa: E402
+    async_get_dispatcher,
+)
+
+# Largest accepted ratio between the slowest and the fastest round
+MAX_COST_RATIO = 3.0
+
+
+async def async_bench(covers: int, rounds: list[int], repeat: int) -> bool:
+    """Run the benchmark, return if the dispatch cost stayed flat."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        dispatcher = async_get_dispatcher(hass)
+        calls = 0
+        spent = 0.0
+        dispatch = dispatcher._async_dispatch
+
+        @callback
+        def timed_dispatch(event) -> None:
+            """Time every call into the dispatcher."""
+            nonlocal calls, spent
+            start = time.perf_counter()
+            dispatch(event)
+            spent += time.perf_counter() - start
+            calls += 1
+
+        # Replaced before any registration, so the trackers call the timed one
+        dispatcher._async_dispatch = timed_dispatch
+
+        wired = [
+            f"switch.cover_{cover}_{relay}"
+            for cover in range(covers)
+            for relay in ("up", "down")
+        ]
+        for cover in range(covers):
+            dispatcher.async_register(
+                wired[2 * cover : 2 * cover + 2], lambda event: None
+            )
+
+        costs = []
+        print(f"{covers} covers, {dispatcher.tracked_entities} tracked entities")
+        print(f"{'unrelated':>10} {'per wired change':>18} {'dispatcher calls':>17}")
+        serial = itertools.count()
+        for unrelated in rounds:
+            best = None
+            for _ in range(repeat):
+                turn = next(serial)
+                calls = 0
+                spent = 0.0
+                dispatched = dispatcher.events_dispatched
+                noise = iter(range(unrelated))
+                per_change = unrelated // len(wired)
+                for entity_id in wired:
+                    hass.states.async_set(entity_id, str(turn))
+                    for index in itertools.islice(noise, per_change):
+                        hass.states.async_set(f"sensor.noise_{index}", str(turn))
+                for index in noise:
+                    hass.states.async_set(f"sensor.noise_{index}", str(turn))
+                await hass.async_block_till_done()
+                # Only the wired changes may reach the dispatcher
+                if calls != len(wired) or (
+                    dispatcher.events_dispatched - dispatched != len(wired)
+                ):
+                    print(f"{calls} dispatcher calls for {len(wired)} wired changes")
+                    return False
+                cost = spent / len(wired)
+                best = cost if best is None else min(best, cost)
+            costs.append(best)
+            print(f"{unrelated:>10} {best * 1e6:>15.2f}us {calls:>17}")
+
+        await hass.async_stop(force=True)
+
+    ratio = max(costs) / min(costs)
+    print(f"cost ratio between rounds: {ratio:.2f} (max {MAX_COST_RATIO})")
+    return ratio <= MAX_COST_RATIO
+
+
+def main() -> int:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--covers", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        nargs="+",
+        default=[0, 1000, 10000, 50000],
+        help="number of unrelated entities changing state in each round",
+    )
+    args = parser.parse_args()
+    return 0 if asyncio.run(async_bench(args.covers, args.rounds, args.repeat)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Check that covers can be provisioned on an install without any.
+
+Sets the integration up from its YAML key alone on a fresh instance, then
+creates a cover with the provision service. A second fresh instance gets its
+covers from a manifest under the YAML key instead.
+
+Run from the repository root:
+
+    python scripts/check_provision.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.bootstrap import async_load_base_functionality  # noqa: E402
+from homeassistant.config_entries import ConfigEntries  # noqa: E402
+from homeassistant.config_entries import ConfigEntryState  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.loader import async_setup as async_setup_loader  # noqa: E402
+from homeassistant.setup import async_setup_component  # noqa: E402
+
+from custom_components.cover_time_based.const import DOMAIN  # noqa: E402
+from custom_components.cover_time_based.const import SERVICE_PROVISION  # noqa: E402
+
+MANIFEST = [
+    {"name": "Kitchen", "up": "switch.kitchen_up", "down": "switch.kitchen_down"},
+    {"name": "Office", "up": "switch.office_up", "down": "switch.office_down"},
+]
+
+
+async def async_setup_hass(config_dir: str) -> HomeAssistant:
+    """Return a running instance with the registries, but no config entries."""
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    async_setup_loader(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await async_load_base_functionality(hass)
+    assert await async_setup_component(hass, "homeassistant", {})
+    for cover in MANIFEST:
+        for relay in ("up", "down"):
+            hass.states.async_set(cover[relay], "off")
+    return hass
+
+
+def covers_created(hass: HomeAssistant) -> bool:
+    """Return if every cover of the manifest has a loaded entry."""
+    entries = hass.config_entries.async_entries(DOMAIN)
+    return sorted(entry.title for entry in entries) == sorted(
+        cover["name"] for cover in MANIFEST
+    ) and all(entry.state is ConfigEntryState.LOADED for entry in entries)
+
+
+async def async_check_service() -> bool:
+    """Provision through the service, with only the YAML key configured."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_setup_hass(config_dir)
+        await hass.async_start()
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: None})
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_PROVISION,
+            {"covers": [{**cover, "time_open": 20} for cover in MANIFEST]},
+            blocking=True,
+            return_response=True,
+        )
+        await hass.async_block_till_done()
+        print(f"service response: {response}")
+        created = covers_created(hass)
+        await hass.async_stop(force=True)
+    return created
+
+
+async def async_check_yaml() -> bool:
+    """Provision from a manifest under the YAML key when started."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_setup_hass(config_dir)
+        assert await async_setup_component(
+            hass,
+            DOMAIN,
+            {DOMAIN: {"covers": [{**cover, "time_open": 20} for cover in MANIFEST]}},
+        )
+        await hass.async_start()
+        await hass.async_block_till_done()
+        print(f"entries: {hass.config_entries.async_entries(DOMAIN)}")
+        created = covers_created(hass)
+        await hass.async_stop(force=True)
+    return created
+
+
+async def async_check() -> bool:
+    """Run both checks."""
+    service = await async_check_service()
+    print(f"provision service on a fresh install: {'ok' if service else 'FAILED'}")
+    yaml = await async_check_yaml()
+    print(f"YAML manifest on a fresh install: {'ok' if yaml else 'FAILED'}")
+    return service and yaml
+
+
+def main() -> int:
+    """Run the check."""
+    return 0 if asyncio.run(async_check()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Check that a recalibration over the drift budget ends after one cycle.
+
+Sets up a cover with a drift budget smaller than the drift of the trip back
+from the end stop, moves it past the budget and counts the relay starts. The
+move, the calibration and the return have to be all of them; another start
+means the return trip set off the next recalibration.
+
+Run from the repository root:
+
+    python scripts/check_recalibration.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.bootstrap import async_load_base_functionality  # noqa: E402
+from homeassistant.config_entries import ConfigEntries  # noqa: E402
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.config_entries import ConfigEntryState  # noqa: E402
+from homeassistant.config_entries import SOURCE_USER  # noqa: E402
+from homeassistant.const import EVENT_STATE_CHANGED  # noqa: E402
+from homeassistant.const import STATE_ON  # noqa: E402
+from homeassistant.core import callback  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.loader import async_setup as async_setup_loader  # noqa: E402
+from homeassistant.setup import async_setup_component  # noqa: E402
+
+from custom_components.cover_time_based.const import CONF_DRIFT_BUDGET  # noqa: E402
+from custom_components.cover_time_based.const import CONF_ENTITY_DOWN  # noqa: E402
+from custom_components.cover_time_based.const import CONF_ENTITY_UP  # noqa: E402
+from custom_components.cover_time_based.const import CONF_TIME_CLOSE  # noqa: E402
+from custom_components.cover_time_based.const import CONF_TIME_OPEN  # noqa: E402
+from custom_components.cover_time_based.const import DOMAIN  # noqa: E402
+
+TRAVEL_TIME = 2
+# A second of travel drifts 0.1%, the trip back from the end stop twice that
+DRIFT_BUDGET = 0.05
+# Relay starts of the move over the budget, the calibration and the return
+EXPECTED_STARTS = 3
+
+
+async def async_setup_hass(config_dir: str) -> HomeAssistant:
+    """Return a running instance with the registries and config entries."""
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    async_setup_loader(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await async_load_base_functionality(hass)
+    assert await async_setup_component(hass, "homeassistant", {})
+    await hass.async_start()
+    return hass
+
+
+async def async_check() -> bool:
+    """Run the check, return if the recalibration ended after one cycle."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_setup_hass(config_dir)
+        assert await async_setup_component(
+            hass, "input_boolean", {"input_boolean": {"up": None, "down": None}}
+        )
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="Recalibration",
+            data={},
+            source=SOURCE_USER,
+            options={
+                CONF_ENTITY_UP: "input_boolean.up",
+                CONF_ENTITY_DOWN: "input_boolean.down",
+                CONF_TIME_OPEN: TRAVEL_TIME,
+                CONF_TIME_CLOSE: TRAVEL_TIME,
+                CONF_DRIFT_BUDGET: DRIFT_BUDGET,
+            },
+        )
+        await hass.config_entries.async_add(entry)
+        assert entry.state is ConfigEntryState.LOADED, entry.state
+        entity_id = "cover.recalibration"
+
+        # From the end stop, so the position is known
+        await hass.services.async_call(
+            "cover", "open_cover", {"entity_id": entity_id}, blocking=True
+        )
+        await asyncio.sleep(TRAVEL_TIME * 1.5)
+        await hass.async_block_till_done()
+
+        starts = []
+
+        @callback
+        def async_relay_changed(event) -> None:
+            """Record every relay turned on."""
+            if (
+                event.data["entity_id"].startswith("input_boolean.")
+                and event.data["new_state"].state == STATE_ON
+            ):
+                starts.append(event.data["entity_id"])
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, async_relay_changed)
+        await hass.services.async_call(
+            "cover",
+            "set_cover_position",
+            {"entity_id": entity_id, "position": 50},
+            blocking=True,
+        )
+        # Long enough for a second cycle to start
+        await asyncio.sleep(TRAVEL_TIME * 5)
+        await hass.async_block_till_done()
+        state = hass.states.get(entity_id)
+
+        await hass.async_stop(force=True)
+
+    print(f"relay starts: {starts}")
+    print(f"final state: {state.state}, {state.attributes}")
+    return len(starts) == EXPECTED_STARTS
+
+
+def main() -> int:
+    """Run the check."""
+    return 0 if asyncio.run(async_check()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
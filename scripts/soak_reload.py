@@ -0,0 +1,239 @@
+"""Soak the config entry reloads for leaked subscriptions and slots.
+
+Sets up a number of covers on a Home Assistant instance with the registries
+loaded, then reloads one entry after the other while its cover is traveling.
+After every pass the shared dispatchers, the motion scheduler, the fleet
+store, the covers and the power group have to be back at the size they had
+before the first reload, and so do the bus listeners and the state change and
+registry trackers of Home Assistant. The time spent dispatching a state
+change of a wired relay has to stay flat.
+
+Run from the repository root:
+
+    python scripts/soak_reload.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.bootstrap import async_load_base_functionality  # noqa: E402
+from homeassistant.config_entries import ConfigEntries  # noqa: E402
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.config_entries import ConfigEntryState  # noqa: E402
+from homeassistant.config_entries import SOURCE_USER  # noqa: E402
+from homeassistant.core import callback  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers.event import (  # noqa: E402
+    TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS,
+)
+from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS  # noqa: E402
+from homeassistant.loader import async_setup as async_setup_loader  # noqa: E402
+from homeassistant.setup import async_setup_component  # noqa: E402
+
+from custom_components.cover_time_based.const import CONF_ENTITY_DOWN  # noqa: E402
+from custom_components.cover_time_based.const import CONF_ENTITY_UP  # noqa: E402
+from custom_components.cover_time_based.const import CONF_POWER_GROUP  # noqa: E402
+from custom_components.cover_time_based.const import (  # noqa: E402
+    CONF_POWER_GROUP_MAX,
+)
+from custom_components.cover_time_based.const import CONF_TIME_CLOSE  # noqa: E402
+from custom_components.cover_time_based.const import CONF_TIME_OPEN  # noqa: E402
+from custom_components.cover_time_based.const import DOMAIN  # noqa: E402
+from custom_components.cover_time_based.dispatcher import (  # noqa: E402
+    async_get_dispatcher,
+)
+from custom_components.cover_time_based.dispatcher import (  # noqa: E402
+    async_get_registry_dispatcher,
+)
+from custom_components.cover_time_based.fleet import async_get_fleet  # noqa: E402
+from custom_components.cover_time_based.motion import (  # noqa: E402
+    async_get_motion_scheduler,
+)
+from custom_components.cover_time_based.power import (  # noqa: E402
+    async_get_power_group,
+)
+from custom_components.cover_time_based.services import (  # noqa: E402
+    async_get_covers,
+)
+
+# Largest accepted ratio between the dispatch cost after and before the soak
+MAX_COST_RATIO = 2.0
+# Wired state changes timed for one cost sample, the best sample is kept
+SAMPLE_CHANGES = 2000
+SAMPLES = 5
+POWER_GROUP = "soak"
+
+
+async def async_setup_hass(config_dir: str) -> HomeAssistant:
+    """Return a running instance with the registries and config entries."""
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    async_setup_loader(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await async_load_base_functionality(hass)
+    assert await async_setup_component(hass, "homeassistant", {})
+    await hass.async_start()
+    return hass
+
+
+async def async_soak(covers: int, reloads: int, passes: int) -> bool:
+    """Run the soak, return if nothing leaked and the dispatch cost stayed flat."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_setup_hass(config_dir)
+        relays = {
+            f"cover_{cover}_{relay}": None
+            for cover in range(covers)
+            for relay in ("up", "down")
+        }
+        assert await async_setup_component(
+            hass, "input_boolean", {"input_boolean": relays}
+        )
+
+        # Wrapped before any cover registers, so the trackers call the timed one
+        dispatcher = async_get_dispatcher(hass)
+        dispatch = dispatcher._async_dispatch
+        spent = 0.0
+
+        @callback
+        def timed_dispatch(event) -> None:
+            """Time every call into the dispatcher."""
+            nonlocal spent
+            start = time.perf_counter()
+            dispatch(event)
+            spent += time.perf_counter() - start
+
+        dispatcher._async_dispatch = timed_dispatch
+
+        entries = []
+        for cover in range(covers):
+            entry = ConfigEntry(
+                version=1,
+                minor_version=1,
+                domain=DOMAIN,
+                title=f"Soak {cover}",
+                data={},
+                source=SOURCE_USER,
+                options={
+                    CONF_ENTITY_UP: f"input_boolean.cover_{cover}_up",
+                    CONF_ENTITY_DOWN: f"input_boolean.cover_{cover}_down",
+                    CONF_TIME_OPEN: 600,
+                    CONF_TIME_CLOSE: 600,
+                    # Room for all, only the members are counted
+                    CONF_POWER_GROUP: POWER_GROUP,
+                    CONF_POWER_GROUP_MAX: covers,
+                },
+            )
+            await hass.config_entries.async_add(entry)
+            assert entry.state is ConfigEntryState.LOADED, entry.state
+            entries.append(entry)
+        await hass.async_block_till_done()
+
+        serial = itertools.count()
+
+        async def async_sample() -> float:
+            """Return the dispatch cost of a wired state change."""
+            nonlocal spent
+            best = None
+            for _ in range(SAMPLES):
+                spent = 0.0
+                # Only the attributes change, the covers ignore those
+                for entity_id in itertools.islice(
+                    itertools.cycle(f"input_boolean.{relay}" for relay in relays),
+                    SAMPLE_CHANGES,
+                ):
+                    state = hass.states.get(entity_id)
+                    hass.states.async_set(
+                        entity_id, state.state, {"soak": next(serial)}
+                    )
+                await hass.async_block_till_done()
+                cost = spent / SAMPLE_CHANGES
+                best = cost if best is None else min(best, cost)
+            return best
+
+        def census() -> dict[str, int]:
+            """Return the sizes that have to survive the reloads."""
+            power_group = async_get_power_group(hass, POWER_GROUP, covers)
+            return {
+                "bus listeners": sum(hass.bus.async_listeners().values()),
+                "state change trackers": sum(
+                    len(jobs)
+                    for jobs in hass.data.get(TRACK_STATE_CHANGE_CALLBACKS, {}).values()
+                ),
+                "registry update trackers": sum(
+                    len(jobs)
+                    for jobs in hass.data.get(
+                        TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS, {}
+                    ).values()
+                ),
+                "covers": len(async_get_covers(hass)),
+                "power group members": power_group.members,
+                "power group running": power_group.running,
+                "tracked_entities": dispatcher.tracked_entities,
+                "registrations": dispatcher.registrations,
+                "registry tracked_entities": async_get_registry_dispatcher(
+                    hass
+                ).tracked_entities,
+                "MotionScheduler.moving": async_get_motion_scheduler(hass).moving,
+                "len(fleet)": len(async_get_fleet(hass)),
+            }
+
+        baseline = census()
+        base_cost = await async_sample()
+        print(f"{covers} covers, baseline {baseline}")
+        print(f"baseline cost {base_cost * 1e6:.2f}us per wired change")
+
+        failed = False
+        for soak_pass in range(passes):
+            for entry in itertools.islice(itertools.cycle(entries), reloads):
+                # Reload while traveling, the old cover is still being driven
+                await hass.services.async_call(
+                    "cover",
+                    "open_cover",
+                    {"entity_id": f"cover.{entry.title.lower().replace(' ', '_')}"},
+                    blocking=True,
+                )
+                assert async_get_motion_scheduler(hass).moving == 1
+                assert await hass.config_entries.async_reload(entry.entry_id)
+            await hass.async_block_till_done()
+            current = census()
+            cost = await async_sample()
+            print(
+                f"pass {soak_pass + 1}: {reloads} reloads, {current}, "
+                f"{cost * 1e6:.2f}us per wired change"
+            )
+            for name, size in baseline.items():
+                if current[name] != size:
+                    print(f"{name} is {current[name]}, was {size}")
+                    failed = True
+            if cost / base_cost > MAX_COST_RATIO:
+                print(f"cost grew {cost / base_cost:.2f}x (max {MAX_COST_RATIO})")
+                failed = True
+
+        await hass.async_stop(force=True)
+
+    return not failed
+
+
+def main() -> int:
+    """Parse the arguments and run the soak."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--covers", type=int, default=20)
+    parser.add_argument(
+        "--reloads", type=int, default=1000, help="config entry reloads per pass"
+    )
+    parser.add_argument("--passes", type=int, default=3)
+    args = parser.parse_args()
+    return 0 if asyncio.run(async_soak(args.covers, args.reloads, args.passes)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())